@@ -4,11 +4,35 @@
 从 YAML 文件加载配置，支持环境变量替换
 """
 
+import copy
 import os
 import yaml
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, Union
 from pathlib import Path
 
+# 优先使用 libyaml C 解析器
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+
+@lru_cache(maxsize=None)
+def _parse_yaml_cached(path: str, mtime_ns: int) -> Any:
+    # 以 (路径, 修改时间) 为键：文件改动后自动重新解析
+    return yaml.load(Path(path).read_bytes(), Loader=SafeLoader)
+
+
+def load_yaml_file(file_path: Union[str, Path]) -> Any:
+    """
+    读取并解析 YAML 文件（C 解析器 + 按修改时间缓存）
+
+    返回深拷贝，调用方修改结果不会污染缓存
+    """
+    path = os.fspath(file_path)
+    return copy.deepcopy(_parse_yaml_cached(os.path.abspath(path), os.stat(path).st_mtime_ns))
+
 
 class ConfigLoader:
     """
@@ -78,7 +102,7 @@ class ConfigLoader:
                 content = f.read()
                 # 替换环境变量
                 content = self._replace_env_vars(content)
-                return yaml.safe_load(content)
+                return yaml.load(content, Loader=SafeLoader)
         except Exception as e:
             print(f"❌ 加载配置文件失败 {file_path}: {e}")
             return {}
@@ -184,4 +208,4 @@ def get_config_loader() -> ConfigLoader:
 
 
 # 导出
-__all__ = ["ConfigLoader", "get_config_loader"]
+__all__ = ["ConfigLoader", "get_config_loader", "load_yaml_file"]
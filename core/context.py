@@ -7,6 +7,7 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 import json
+import sys
 from pathlib import Path
 
 
@@ -54,6 +55,33 @@ class Position:
         }
 
 
+@dataclass(slots=True)
+class OrderBookDepth:
+    """买一卖一深度"""
+
+    bid_1_price: float = 0.0
+    bid_1_amount: float = 0.0
+    ask_1_price: float = 0.0
+    ask_1_amount: float = 0.0
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, float]) -> "OrderBookDepth":
+        return cls(
+            bid_1_price=float(data.get("bid_1_price", 0.0)),
+            bid_1_amount=float(data.get("bid_1_amount", 0.0)),
+            ask_1_price=float(data.get("ask_1_price", 0.0)),
+            ask_1_amount=float(data.get("ask_1_amount", 0.0)),
+        )
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "bid_1_price": self.bid_1_price,
+            "bid_1_amount": self.bid_1_amount,
+            "ask_1_price": self.ask_1_price,
+            "ask_1_amount": self.ask_1_amount,
+        }
+
+
 @dataclass
 class MarketData:
     """市场数据"""
@@ -64,7 +92,11 @@ class MarketData:
     funding_rate: float
     next_funding_time: Optional[datetime]
     volume_24h: float
-    depth: Dict[str, float]  # 买一卖一深度
+    depth: OrderBookDepth  # 买一卖一深度（兼容传入 dict）
+
+    def __post_init__(self):
+        if isinstance(self.depth, dict):
+            self.depth = OrderBookDepth.from_dict(self.depth)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -76,7 +108,7 @@ class MarketData:
                 self.next_funding_time.isoformat() if self.next_funding_time else None
             ),
             "volume_24h": self.volume_24h,
-            "depth": self.depth,
+            "depth": self.depth.to_dict(),
         }
 
 
@@ -154,8 +186,17 @@ class Context:
         # 配置缓存
         self._config_cache: Dict[str, Any] = {}
 
+        # 主循环轮次：同一轮内保证金率只计算一次（0 表示未启用，每次调用都重新计算）
+        self.tick_id: int = 0
+        self._margin_ratio_tick: int = -1
+
+    def begin_tick(self):
+        """主循环每轮开始时调用，使本轮派生数据的缓存失效"""
+        self.tick_id += 1
+
     def update_balance(self, currency: str, available: float, frozen: float):
         """更新余额"""
+        self._margin_ratio_tick = -1
         self.balances[currency] = Balance(
             currency=currency,
             available=available,
@@ -167,10 +208,13 @@ class Context:
                         quantity: Optional[float] = None, avg_price: Optional[float] = None,
                         pnl: Optional[float] = None):
         """更新持仓 (支持多种参数形式)"""
+        self._margin_ratio_tick = -1
         if position:
             # 如果传入 Position 对象，直接使用
-            self.positions[position.symbol] = position
+            self.positions[sys.intern(position.symbol)] = position
         elif symbol is not None:
+            # 交易所响应解析出的品种名每次都是新字符串，驻留后字典查找走同一对象的快速路径
+            symbol = sys.intern(symbol)
             # 如果传入的是单独参数，创建或更新 Position
             current_pos = self.positions.get(symbol)
             if current_pos:
@@ -196,7 +240,7 @@ class Context:
 
     def update_market_data(self, market_data: MarketData):
         """更新市场数据"""
-        self.market_data[market_data.symbol] = market_data
+        self.market_data[sys.intern(market_data.symbol)] = market_data
 
     def get_balance(self, currency: str) -> Optional[Balance]:
         """获取余额"""
@@ -223,7 +267,10 @@ class Context:
         return total_value
 
     def calculate_margin_ratio(self) -> float:
-        """计算保证金率"""
+        """计算保证金率（同一轮主循环内复用结果，余额 / 持仓经 update_* 变化时重新计算）"""
+        if self.tick_id and self._margin_ratio_tick == self.tick_id:
+            return self.margin_ratio
+
         total_margin = sum(pos.margin_used for pos in self.positions.values())
         total_equity = self.get_total_balance()
 
@@ -233,6 +280,7 @@ class Context:
             # 无持仓时设为 9999 代表“空闲状态”
             self.margin_ratio = 9999
 
+        self._margin_ratio_tick = self.tick_id
         return self.margin_ratio
 
     def update_scan_results(self, scan_results: List[Dict[str, Any]]):
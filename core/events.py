@@ -3,6 +3,7 @@
 定义系统中所有可能的事件类型、事件数据结构以及事件总线
 """
 
+import asyncio
 from enum import Enum
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -62,9 +63,9 @@ class EventType(Enum):
     HEARTBEAT = "heartbeat"               # 心跳检测
 
 
-@dataclass
+@dataclass(frozen=True)
 class Event:
-    """基础事件类"""
+    """基础事件类（不可变：发布后可被多个订阅者安全持有）"""
     event_type: EventType
     timestamp: datetime = field(default_factory=datetime.now)
     data: Dict[str, Any] = field(default_factory=dict)
@@ -80,7 +81,7 @@ class Event:
         }
 
 
-@dataclass
+@dataclass(frozen=True)
 class MarketEvent(Event):
     """市场事件专有结构"""
     symbol: str = ""
@@ -88,7 +89,7 @@ class MarketEvent(Event):
     volume: float = 0.0
 
 
-@dataclass
+@dataclass(frozen=True)
 class FundingRateEvent(Event):
     """资金费率事件专有结构"""
     symbol: str = ""
@@ -96,7 +97,7 @@ class FundingRateEvent(Event):
     next_funding_time: Optional[datetime] = None
 
 
-@dataclass
+@dataclass(frozen=True)
 class StrategyEvent(Event):
     """策略事件专有结构"""
     symbol: str = ""
@@ -105,7 +106,7 @@ class StrategyEvent(Event):
     confidence: float = 0.0  # 信心度 0-1
 
 
-@dataclass
+@dataclass(frozen=True)
 class RiskEvent(Event):
     """风险事件专有结构"""
     risk_type: str = ""
@@ -115,7 +116,7 @@ class RiskEvent(Event):
     message: str = ""
 
 
-@dataclass
+@dataclass(frozen=True)
 class OrderEvent(Event):
     """订单事件专有结构"""
     symbol: str = ""
@@ -132,9 +133,14 @@ class EventBus:
     负责系统中所有组件的解耦通信
     """
 
-    def __init__(self):
+    def __init__(self, max_pending: int = 10000):
         self._subscribers: Dict[EventType, List[Callable]] = {}
 
+        # post() 的后台投递队列与任务（首次 post 时创建）
+        self._max_pending = max_pending
+        self._pending: Optional[asyncio.Queue] = None
+        self._drain_task: Optional[asyncio.Task] = None
+
     def subscribe(self, event_type: EventType, callback: Callable):
         """订阅事件"""
         if event_type not in self._subscribers:
@@ -167,4 +173,44 @@ class EventBus:
                     await callback(event)
                 except Exception as e:
                     # 生产环境建议接入 logger
-                    print(f"🔥 [EventBus] 转发事件 {event.event_type.value} 出错: {e}")
\ No newline at end of file
+                    print(f"🔥 [EventBus] 转发事件 {event.event_type.value} 出错: {e}")
+
+    def post(self, event: Event) -> bool:
+        """
+        发布事件但不等待订阅者处理：事件进入有界队列，由后台任务按顺序 publish
+        适用于通知类事件（心跳等），需要订阅者处理完才能继续的场景仍用 publish
+
+        Returns:
+            False 表示队列已满，事件被丢弃
+        """
+        if event.event_type not in self._subscribers:
+            return True
+
+        if self._drain_task is None or self._drain_task.done():
+            if self._pending is None:
+                self._pending = asyncio.Queue(maxsize=self._max_pending)
+            self._drain_task = asyncio.get_running_loop().create_task(self._drain())
+
+        try:
+            self._pending.put_nowait(event)
+        except asyncio.QueueFull:
+            print(f"⚠️ [EventBus] 待投递事件已满 ({self._max_pending})，丢弃 {event.event_type.value}")
+            return False
+        return True
+
+    async def _drain(self):
+        while True:
+            event = await self._pending.get()
+            try:
+                await self.publish(event)
+            finally:
+                self._pending.task_done()
+
+    async def close(self):
+        """投递完队列中剩余的事件后停止后台任务"""
+        if self._drain_task is None:
+            return
+        if not self._drain_task.done():
+            await self._pending.join()
+            self._drain_task.cancel()
+        self._drain_task = None
@@ -0,0 +1,25 @@
+"""
+⚡ JIT 加速（可选依赖 numba）
+安装 numba 时使用 @njit 编译数值内核；未安装时退化为普通 Python 函数
+"""
+
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """numba 未安装时的占位装饰器：原样返回函数"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
+
+
+__all__ = ["njit", "prange", "NUMBA_AVAILABLE"]
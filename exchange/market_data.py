@@ -7,7 +7,7 @@ from typing import Optional, List
 import logging
 from datetime import datetime
 
-from core.context import MarketData
+from core.context import MarketData, OrderBookDepth
 from exchange.okx_client import OKXClient
 
 
@@ -65,19 +65,19 @@ class MarketDataFetcher:
 
             # 获取订单簿深度
             order_book = await self.okx_client.get_order_book(futures_symbol, sz=1)
-            depth = {}
+            depth = OrderBookDepth()
 
             if order_book and len(order_book) > 0:
                 bids = order_book[0].get("bids", [])
                 asks = order_book[0].get("asks", [])
 
                 if bids:
-                    depth["bid_1_price"] = float(bids[0][0])
-                    depth["bid_1_amount"] = float(bids[0][1])
+                    depth.bid_1_price = float(bids[0][0])
+                    depth.bid_1_amount = float(bids[0][1])
 
                 if asks:
-                    depth["ask_1_price"] = float(asks[0][0])
-                    depth["ask_1_amount"] = float(asks[0][1])
+                    depth.ask_1_price = float(asks[0][0])
+                    depth.ask_1_amount = float(asks[0][1])
 
             # 获取24h成交量
             volume_24h = float(futures_ticker[0].get("volCcy24h", 0))
@@ -28,6 +28,12 @@ from exchange.base import ExchangeBase
 from core.events import Event, EventType
 from core.config_loader import get_config_loader
 
+# 可选：orjson 解析响应，未安装时使用标准库
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
 
 class OKXExchange(ExchangeBase):
     """
@@ -254,7 +260,7 @@ class OKXExchange(ExchangeBase):
                 self.logger.error(f"API HTTP Error {response.status}: {text}")
                 return None
             
-            result = await response.json()
+            result = _json_loads(await response.read())
             
             if result.get("code") != "0":
                 self.logger.error(f"API Business Error: {result}")
@@ -639,7 +645,7 @@ class OKXExchange(ExchangeBase):
         try:
             async for msg in self.ws_connection:
                 if msg.type == aiohttp.WSMsgType.TEXT:
-                    data = json.loads(msg.data)
+                    data = _json_loads(msg.data)
                     
                     # 处理行情数据
                     if data.get("data"):
@@ -3,15 +3,64 @@
 """
 
 import os
+import asyncio
 import aiohttp
 import logging
 import hmac
+import hashlib
 import base64
 import json
 import urllib.parse
+from operator import itemgetter
 from typing import Optional, Dict, List
 from datetime import datetime, timezone
 
+import numpy as np
+
+from core.rate_limiting import RateLimiter
+
+# 可选：orjson 解析响应 / 序列化请求体（大批量 Ticker、批量下单明显更快），未安装时使用标准库
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+# OKX 批量下单 / 撤单每次请求最多 20 个订单
+BATCH_LIMIT = 20
+
+# 挂单字段提取（C 实现，一次取两列）
+_order_ids = itemgetter("instId", "ordId")
+
+# 默认限流规则（令牌桶，按端点类别；参考 OKX 各类接口的 2 秒窗口限频）
+_DEFAULT_RATE_LIMITS = {
+    "default_capacity": 10,
+    "default_refill_rate": 5.0,
+    "rules": {
+        "orders": {"capacity": 20, "refill_rate": 10.0},
+        "cancel": {"capacity": 20, "refill_rate": 10.0},
+        "public": {"capacity": 40, "refill_rate": 20.0},
+    },
+}
+
+
+def _rate_limit_bucket(endpoint: str) -> str:
+    """端点 → 限流类别"""
+    if endpoint.startswith(("/api/v5/market/", "/api/v5/public/")):
+        return "public"
+    if endpoint.startswith("/api/v5/trade/cancel"):
+        return "cancel"
+    if endpoint.startswith("/api/v5/trade/"):
+        return "orders"
+    return "default"
+
 class OKXClient:
     def __init__(self, config: dict):
         self.config = config
@@ -22,11 +71,28 @@ class OKXClient:
         self.api_passphrase = os.getenv("OKX_API_PASSPHRASE", config.get("api_passphrase", ""))
         self.sandbox = config.get("sandbox", False)
 
+        # 签名用的 HMAC 上下文与固定请求头只构建一次，每次请求复制后再填入签名
+        self._hmac = hmac.new(self.api_secret.encode("utf-8"), digestmod=hashlib.sha256)
+        self._base_headers = {
+            "OK-ACCESS-KEY": self.api_key,
+            "OK-ACCESS-PASSPHRASE": self.api_passphrase,
+            "Content-Type": "application/json",
+        }
+        if self.sandbox:
+            self._base_headers["x-simulated-trading"] = "1"
+
         # 获取代理配置
         self.proxy = os.getenv("HTTPS_PROXY") or os.getenv("HTTP_PROXY")
 
         self.base_url = "https://www.okx.com"
+        # 发送前准入：令牌不足时在签名之前等待，而不是事后收到 429
+        self.rate_limiter = RateLimiter(config.get("rate_limits", _DEFAULT_RATE_LIMITS))
         self.session: Optional[aiohttp.ClientSession] = None
+        # 会话级超时：总超时 10 秒，建连 3 秒（防止个别请求拖尾）
+        self.timeout = aiohttp.ClientTimeout(
+            total=config.get("request_timeout", 10),
+            connect=config.get("connect_timeout", 3),
+        )
         self.logger = logging.getLogger(__name__)
 
         if self.proxy:
@@ -35,7 +101,16 @@ class OKXClient:
     async def connect(self) -> bool:
         try:
             if self.session is None:
-                self.session = aiohttp.ClientSession()
+                # 长连接池：复用 TCP/TLS 连接，缓存 DNS
+                pool_size = self.config.get("pool_size", 64)
+                connector = aiohttp.TCPConnector(
+                    limit=pool_size,
+                    limit_per_host=pool_size,
+                    ttl_dns_cache=600,
+                    keepalive_timeout=75,
+                    enable_cleanup_closed=True,
+                )
+                self.session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
             return True
         except Exception as e:
             self.logger.error(f"Failed to create session: {e}")
@@ -46,30 +121,30 @@ class OKXClient:
             await self.session.close()
             self.session = None
 
+    async def __aenter__(self) -> "OKXClient":
+        """async with OKXClient(...) as client：块内所有请求共用同一连接池，退出时断开"""
+        if not await self.connect():
+            raise ConnectionError("无法创建 OKX 会话")
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.disconnect()
+
     def _get_timestamp(self) -> str:
         return datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
 
-    def _sign(self, timestamp: str, method: str, request_path: str, body: str = "") -> str:
-        message = f"{timestamp}{method.upper()}{request_path}{body}"
-        mac = hmac.new(
-            bytes(self.api_secret, encoding='utf8'),
-            bytes(message, encoding='utf-8'),
-            digestmod='sha256'
-        )
+    def _sign(self, timestamp: str, method: str, request_path: str, body: bytes = b"") -> str:
+        mac = self._hmac.copy()
+        mac.update(f"{timestamp}{method.upper()}{request_path}".encode("utf-8"))
+        mac.update(body)
         return base64.b64encode(mac.digest()).decode()
 
-    def _get_headers(self, method: str, request_path: str, body: str = "") -> Dict[str, str]:
+    def _get_headers(self, method: str, request_path: str, body: bytes = b"") -> Dict[str, str]:
         timestamp = self._get_timestamp()
         sign = self._sign(timestamp, method, request_path, body)
-        headers = {
-            "OK-ACCESS-KEY": self.api_key,
-            "OK-ACCESS-SIGN": sign,
-            "OK-ACCESS-TIMESTAMP": timestamp,
-            "OK-ACCESS-PASSPHRASE": self.api_passphrase,
-            "Content-Type": "application/json",
-        }
-        if self.sandbox:
-            headers["x-simulated-trading"] = "1"
+        headers = dict(self._base_headers)
+        headers["OK-ACCESS-SIGN"] = sign
+        headers["OK-ACCESS-TIMESTAMP"] = timestamp
         return headers
 
     async def _request(self, method: str, endpoint: str, params: Optional[Dict] = None, data: Optional[Dict] = None) -> Optional[Dict]:
@@ -81,25 +156,28 @@ class OKXClient:
             query_string = urllib.parse.urlencode(params)
             request_path = f"{endpoint}?{query_string}"
 
-        body_str = json.dumps(data) if data else ""
-        headers = self._get_headers(method, request_path, body_str)
+        # 先过限流再签名：签名含时间戳，排队之后再签才不会过期
+        await self.rate_limiter.acquire(_rate_limit_bucket(endpoint))
+
+        # 签名与发送使用同一份字节，避免再做一次编码
+        body = _json_dumps(data) if data else b""
+        headers = self._get_headers(method, request_path, body)
         url = f"{self.base_url}{request_path}"
 
         try:
             async with self.session.request(
                 method=method,
                 url=url,
-                data=body_str if data else None,
+                data=body if data else None,
                 headers=headers,
                 proxy=self.proxy,
-                timeout=aiohttp.ClientTimeout(total=10),
             ) as response:
                 if response.status != 200:
                     text = await response.text()
                     self.logger.error(f"API HTTP Error {response.status}: {text}")
                     return None
 
-                result = await response.json()
+                result = _json_loads(await response.read())
                 if result.get("code") != "0":
                     self.logger.error(f"API Business Error: {result}")
                     return None
@@ -213,21 +291,11 @@ class OKXClient:
             ...
         ]
         """
-        # OKX 限制每批最多 20 个订单
-        BATCH_LIMIT = 20
-        results = []
-
-        # 分批处理
-        for i in range(0, len(orders_data), BATCH_LIMIT):
-            batch = orders_data[i: i + BATCH_LIMIT]
-            self.logger.info(f"⚡ 批量提交订单: {len(batch)} 个")
-
-            res = await self._request("POST", "/api/v5/trade/batch-orders", data=batch)
-            if res:
-                results.extend(res)
-            else:
-                self.logger.error("批量下单部分或全部失败")
-
+        # 各批次并发提交（限流由令牌桶控制）；下单失败不自动重试，避免重复开仓
+        self.logger.info(f"⚡ 批量提交订单: {len(orders_data)} 个")
+        results = await self._post_batches("/api/v5/trade/batch-orders", orders_data)
+        if len(results) < len(orders_data):
+            self.logger.error("批量下单部分或全部失败")
         return results
 
     # 🔥 新增：批量撤单 (Batch Cancel)
@@ -236,12 +304,29 @@ class OKXClient:
         批量撤单
         :param orders_data: [{"instId": "...", "ordId": "..."}, ...]
         """
-        BATCH_LIMIT = 20
-        results = []
+        # 撤单可安全重试：失败的批次再提交一次
+        return await self._post_batches("/api/v5/trade/cancel-batch-orders", orders_data, retries=1)
+
+    async def _post_batches(self, endpoint: str, orders_data: list, retries: int = 0) -> list:
+        """
+        按 BATCH_LIMIT 分批并发 POST，结果按原订单顺序拼接
+
+        :param retries: 失败批次（响应为空）的重试次数，只对幂等操作使用
+        """
+        batches = [orders_data[i: i + BATCH_LIMIT] for i in range(0, len(orders_data), BATCH_LIMIT)]
+        responses = await asyncio.gather(*(self._request("POST", endpoint, data=b) for b in batches))
+
+        for _ in range(retries):
+            failed = [i for i, res in enumerate(responses) if not res]
+            if not failed:
+                break
+            self.logger.warning(f"⚠️ {len(failed)} 个批次失败，重试: {endpoint}")
+            retried = await asyncio.gather(*(self._request("POST", endpoint, data=batches[i]) for i in failed))
+            for i, res in zip(failed, retried):
+                responses[i] = res
 
-        for i in range(0, len(orders_data), BATCH_LIMIT):
-            batch = orders_data[i: i + BATCH_LIMIT]
-            res = await self._request("POST", "/api/v5/trade/cancel-batch-orders", data=batch)
+        results = []
+        for res in responses:
             if res:
                 results.extend(res)
         return results
@@ -249,11 +334,12 @@ class OKXClient:
         # ... (保留原有代码) ...
 
         # 🔥 新增：获取 K 线数据 (Candlesticks)
-    async def get_candlesticks(self, instId: str, bar: str = "1H", limit: int = 100):
+    async def get_candlesticks(self, instId: str, bar: str = "1H", limit: int = 100, as_array: bool = False):
         """
         获取 K 线数据
         :param bar: 时间粒度, e.g., 1m, 1H, 4H, 1D
-        :return: [[ts, o, h, l, c, vol, ...], ...]
+        :param as_array: 为 True 时在解析阶段直接转为 (N, 6) float64 数组，列为 [ts, o, h, l, c, vol]
+        :return: [[ts, o, h, l, c, vol, ...], ...]，或 as_array 时的数组；失败返回 None
         """
         params = {
             "instId": instId,
@@ -261,7 +347,11 @@ class OKXClient:
             "limit": str(limit)
         }
         # OKX API: GET /api/v5/market/candles
-        return await self._request("GET", "/api/v5/market/candles", params=params)
+        klines = await self._request("GET", "/api/v5/market/candles", params=params)
+        if as_array and klines:
+            # 一次性批量解析字符串，下游 normalize_klines 不再逐列转换
+            return np.asarray([row[:6] for row in klines], dtype=np.float64)
+        return klines
 
     # ... (保留 batch_orders 等其他接口) ...
     async def get_pending_orders(self, inst_id: str = None):
@@ -286,20 +376,12 @@ class OKXClient:
                 self.logger.info("✅ 当前无挂单")
                 return []
 
-            results = []
-            for order in pending:
-                target_inst = order.get("instId")
-                ord_id = order.get("ordId")
-                self.logger.info(f"撤销订单: {target_inst} (ID: {ord_id})")
-
-                # 修复：直接调用 self._request 而不是 self.client._request
-                res = await self._request("POST", "/api/v5/trade/cancel-order", data={
-                    "instId": target_inst,
-                    "ordId": ord_id
-                })
-                if res:
-                    results.extend(res)
-            return results
+            orders = [{"instId": inst_id, "ordId": ord_id} for inst_id, ord_id in map(_order_ids, pending)]
+            for order in orders:
+                self.logger.info(f"撤销订单: {order['instId']} (ID: {order['ordId']})")
+
+            # 批量撤单：每 20 个一次请求，代替逐个 cancel-order
+            return await self.cancel_batch_orders(orders)
 
         except Exception as e:
             self.logger.error(f"❌ 撤单异常: {e}")
@@ -81,7 +81,7 @@ class Register:
         self.components["market_data_fetcher"] = market_data_fetcher
 
         # 2. 组装风控层
-        margin_guard = MarginGuard(cfg)
+        margin_guard = MarginGuard(cfg, bus)
         fund_guard = FundGuard(cfg, client)
         circuit_breaker = CircuitBreaker(cfg)
         exchange_guard = ExchangeGuard(cfg)
@@ -13,6 +13,7 @@ from typing import Dict, Optional
 
 from core.context import Context
 from core.state_machine import SystemState
+from risk.liquidation import estimate_long_liquidation, estimate_short_liquidation
 from monitor.dashboard import Dashboard
 
 logger = logging.getLogger("Runtime")
@@ -89,6 +90,7 @@ class Runtime:
         while self.is_running:
             try:
                 now = time.time()
+                self.context.begin_tick()
 
                 # --- 0. 同步交易所持仓 (关键新增!) ---
                 # 每次做决策前，必须先看一眼自己兜里到底有啥
@@ -348,13 +350,11 @@ class Runtime:
                         Dashboard.log(f"🎯 [Strategy] 检测到交易信号: {symbol} {signal.get('side')} {signal.get('reason', '')}", "INFO")
 
             else:
-                # 其他策略保持原有逻辑
-                for candidate in scan_results:
-                    symbol = candidate.symbol
-                    regime = candidate.regime
-                    # 调用策略的 analyze_signal 方法
-                    signal = await self.strategy_manager.generate(symbol, regime)
-
+                # 其他策略：所有候选一次性并发分析（调用各策略的 analyze_signal）
+                candidate_signals = await self.strategy_manager.generate_batch(
+                    [(candidate.symbol, candidate.regime) for candidate in scan_results]
+                )
+                for signal in candidate_signals:
                     if signal:
                         signals.append(signal)
                         self.context.add_strategy_signal(signal)
@@ -388,10 +388,10 @@ class Runtime:
 
             # 尝试调用 check_order (常见命名)
             if hasattr(self.risk_manager, 'check_order'):
-                approval_result = await self.risk_manager.check_order(signal)
+                approval_result = await self.risk_manager.check_order(signal, self.context)
             # 尝试调用 approve (备用命名)
             elif hasattr(self.risk_manager, 'approve'):
-                approval_result = await self.risk_manager.approve(signal)
+                approval_result = await self.risk_manager.approve(signal, self.context)
             else:
                 logger.error("❌ RiskManager 缺少 check_order 或 approve 方法")
                 return {"approved": False, "reason": "Method missing"}
@@ -524,12 +524,10 @@ class Runtime:
             # 计算强平价格（简化公式）
             if side == "buy":
                 # 做多：强平价 = 开仓价 * (1 - 1/杠杆 + 维持保证金率)
-                maintenance_margin_rate = 0.005  # 假设维持保证金率 0.5%
-                liquidation_price = current_price * (1 - 1/leverage + maintenance_margin_rate)
+                liquidation_price = estimate_long_liquidation(current_price, leverage)
             else:
                 # 做空：强平价 = 开仓价 * (1 + 1/杠杆 - 维持保证金率)
-                maintenance_margin_rate = 0.005
-                liquidation_price = current_price * (1 + 1/leverage - maintenance_margin_rate)
+                liquidation_price = estimate_short_liquidation(current_price, leverage)
 
             # 4. 打印审计信息
             Dashboard.log("=" * 80, "INFO")
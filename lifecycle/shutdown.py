@@ -34,6 +34,10 @@ class Shutdown:
                 except Exception as e:
                     logger.error(f"策略清理异常: {e}")
             
+            # 释放市场扫描进程池
+            if "market_scanner" in self.components:
+                self.components["market_scanner"].close()
+            
             # 断开交易所连接
             if "client" in self.components:
                 await self.components["client"].disconnect()
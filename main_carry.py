@@ -23,6 +23,7 @@ from dataclasses import dataclass
 
 # 加载环境变量
 from dotenv import load_dotenv
+import numpy as np
 import yaml
 
 # -----------------------------------------------------------------------------
@@ -102,12 +103,12 @@ class Dashboard:
 
             if i < len(gainers):
                 g = gainers[i]
-                left = f"{g['symbol']:<12} +{g['change']:>6.2%}"
+                left = f"{g.symbol:<12} +{g.change:>6.2%}"
 
             if i < len(turnovers):
                 t = turnovers[i]
-                amt_yi = t['turnover'] / 1e8
-                right = f"{t['symbol']:<12} ${amt_yi:>6.2f}亿"
+                amt_yi = t.turnover / 1e8
+                right = f"{t.symbol:<12} ${amt_yi:>6.2f}亿"
 
             print(f"{left:<40} | {right:<35}")
 
@@ -155,64 +156,122 @@ class Dashboard:
 # -----------------------------------------------------------------------------
 # 5. 核心类：市场扫描器 (Hunter Layer)
 # -----------------------------------------------------------------------------
+def _safe_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _top_k_desc(values: np.ndarray, k: int) -> np.ndarray:
+    """降序前 k 个的下标：argpartition 部分选择 O(N)，只对选出的 k 个排序"""
+    n = len(values)
+    if k <= 0 or n == 0:
+        return np.empty(0, dtype=np.intp)
+    if k >= n:
+        return np.argsort(-values, kind="stable")
+    neg = -values
+    kth = neg[np.argpartition(neg, k - 1)[k - 1]]
+    # 与稳定排序一致：第 k 名并列时取原始顺序靠前的
+    above = np.flatnonzero(neg < kth)
+    ties = np.flatnonzero(neg == kth)[:k - len(above)]
+    idx = np.concatenate((above, ties))
+    return idx[np.lexsort((idx, neg[idx]))]
+
+
+def _to_float_array(rows: list) -> np.ndarray:
+    """行情字段批量转 float64（整批可解析时走快速路径，否则逐个解析，失败记为 NaN）"""
+    try:
+        return np.asarray(rows, dtype=np.float64).reshape(len(rows), -1)
+    except (TypeError, ValueError):
+        return np.array([[_safe_float(v) for v in row] for row in rows], dtype=np.float64)
+
+
+@dataclass(slots=True, frozen=True)
+class ScanRow:
+    """扫描榜单中的一行（固定字段，比 dict 更省内存）"""
+    symbol: str
+    change: float
+    turnover: float
+
+
 class MarketScanner:
-    def __init__(self, client: OKXClient):
+    def __init__(self, client: OKXClient, cache_ttl: float = 5.0, spot_check_concurrency: int = 10):
         self.client = client
+        # 现货审查并发上限（OKX 行情接口限频 20 次 / 2 秒）
+        self._spot_check_sem = asyncio.Semaphore(spot_check_concurrency)
+        # 扫描结果短期缓存：24h 行情几秒内变化不大，轮询时直接复用
+        self._cache_ttl = cache_ttl
+        self._cache: Optional[list] = None
+        self._cache_key = None
+        self._cache_ts = 0.0
 
     async def check_spot_exists(self, symbol: str) -> bool:
         """审查现货资格"""
         try:
-            ticker = await self.client.get_ticker(symbol)
+            async with self._spot_check_sem:
+                ticker = await self.client.get_ticker(symbol)
             return bool(ticker and len(ticker) > 0)
         except:
             return False
 
     async def scan(self, top_n: int = 30) -> list:
         """执行扫描"""
+        now = time.monotonic()
+        if self._cache is not None and self._cache_key == top_n and now - self._cache_ts < self._cache_ttl:
+            return list(self._cache)
+
         # 1. 获取 SWAP 行情
         tickers = await self.client.get_tickers(instType="SWAP")
         if not tickers:
             return ["BTC-USDT", "ETH-USDT"]
 
-        valid_tickers = []
-        for t in tickers:
-            inst_id = t.get("instId", "")
-            if not inst_id.endswith("-USDT-SWAP"): continue
-
-            try:
-                last = float(t.get("last", 0))
-                open24h = float(t.get("open24h", 0))
-                # 统一计算 USDT 成交额 = volCcy24h * last (如果是 U本位 volCcy24h，这里会变大，后面修正)
-                raw_vol = float(t.get("volCcy24h", 0))
-
-                # 智能修正成交额单位
-                turnover_usdt = raw_vol * last
-                if turnover_usdt > 1e13: # 超过10万亿U，说明 raw_vol 本身就是 U
-                    turnover_usdt = raw_vol
-
-                if open24h == 0: continue
-                change_pct = (last - open24h) / open24h
-
-                valid_tickers.append({
-                    "symbol": inst_id.replace("-SWAP", ""),
-                    "change": change_pct,
-                    "turnover": turnover_usdt
-                })
-            except:
-                continue
-
-        # 2. 排序
-        top_gainers = sorted(valid_tickers, key=lambda x: x["change"], reverse=True)[:top_n]
-        top_turnover = sorted(valid_tickers, key=lambda x: x["turnover"], reverse=True)[:top_n]
+        # 一次性解析为 float64 数组（无法解析的值为 NaN，整行剔除）
+        inst_ids = np.array([t.get("instId", "") for t in tickers], dtype=str)
+        fields = _to_float_array(
+            [(t.get("last", 0), t.get("open24h", 0), t.get("volCcy24h", 0)) for t in tickers]
+        )
+        last, open24h, raw_vol = fields[:, 0], fields[:, 1], fields[:, 2]
+
+        # 统一计算 USDT 成交额 = volCcy24h * last
+        # 智能修正成交额单位：超过10万亿U，说明 raw_vol 本身就是 U
+        turnover_usdt = raw_vol * last
+        turnover_usdt = np.where(turnover_usdt > 1e13, raw_vol, turnover_usdt)
+
+        # 后缀匹配整列一次完成，不再逐行调用 str.endswith
+        usdt_swap = np.char.endswith(inst_ids, "-USDT-SWAP")
+        valid = usdt_swap & ~np.isnan(fields).any(axis=1) & (open24h != 0)
+
+        idx = np.flatnonzero(valid)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            change_pct = (last[idx] - open24h[idx]) / open24h[idx]
+        turnover_usdt = turnover_usdt[idx]
+
+        def _rows(order):
+            # 先按 order 批量取出三列（tolist 一次性转 Python float），再在单个推导式中组装
+            return [
+                ScanRow(str(sym).replace("-SWAP", ""), chg, amt)
+                for sym, chg, amt in zip(
+                    inst_ids[idx[order]], change_pct[order].tolist(), turnover_usdt[order].tolist()
+                )
+            ]
+
+        # 2. 排序（只选出前 top_n，不做全量排序）
+        top_gainers = _rows(_top_k_desc(change_pct, top_n))
+        top_turnover = _rows(_top_k_desc(turnover_usdt, top_n))
 
         # 3. 合并与审查
-        candidates = {t["symbol"] for t in top_gainers} | {t["symbol"] for t in top_turnover}
+        candidates = {t.symbol for t in top_gainers} | {t.symbol for t in top_turnover}
         candidates.add("BTC-USDT")
         candidates.add("ETH-USDT")
 
+        # 现货资格并发审查，避免逐个等待 HTTP 往返
+        symbols = list(candidates)
+        exists = await asyncio.gather(*(self.check_spot_exists(sym) for sym in symbols))
+
         final_list = []
-        for sym in candidates:
-            if await self.check_spot_exists(sym):
+        for sym, ok in zip(symbols, exists):
+            if ok:
                 final_list.append(sym)
             else:
                 logger.warning(f"❌ [Scanner] 剔除 {sym}: 无现货交易对")
@@ -220,6 +279,9 @@ class MarketScanner:
         # 4. 打印报告
         Dashboard.print_scan_result(top_gainers, top_turnover, final_list)
 
+        self._cache = list(final_list)
+        self._cache_key = top_n
+        self._cache_ts = time.monotonic()
         return final_list
 
 # -----------------------------------------------------------------------------
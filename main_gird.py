@@ -446,7 +446,7 @@ class QuantEngine:
                     klines = await client.get_candlesticks(self.strategy.symbol, bar=period, limit=50)
                     if klines:
                         market_data[period] = klines
-                        logger.debug(f"获取 {period} K线成功: {len(klines)} 条")
+                        logger.debug("获取 %s K线成功: %d 条", period, len(klines))
                     else:
                         logger.warning(f"获取 {period} K线失败: 返回空")
                 else:
@@ -20,6 +20,22 @@ class Colors:
     UNDERLINE = '\033[4m'
     RESET = '\033[0m'
 
+# 成交额显示单位（阈值, 除数倒数, 后缀）
+_VOLUME_UNITS = (
+    (100000000, 1 / 100000000, "亿"),
+    (1000000, 1 / 1000000, "万"),
+)
+
+
+def _format_volume(volume: float, unit: str = "") -> str:
+    """成交额格式化，如 1.23 亿 USDT"""
+    suffix = f" {unit}" if unit else ""
+    for threshold, scale, label in _VOLUME_UNITS:
+        if volume >= threshold:
+            return f"{volume * scale:.2f} {label}{suffix}"
+    return f"{volume:.2f}{suffix}"
+
+
 class Dashboard:
     @staticmethod
     def clear_screen():
@@ -182,13 +198,7 @@ class Dashboard:
             symbol = result.symbol
 
             # 成交额格式化
-            volume = result.volume_24h
-            if volume >= 100000000:
-                vol_str = f"{volume / 100000000:.2f} 亿"
-            elif volume >= 1000000:
-                vol_str = f"{volume / 1000000:.2f} 万"
-            else:
-                vol_str = f"{volume:.2f}"
+            vol_str = _format_volume(result.volume_24h)
 
             # 涨跌幅颜色
             price_change = result.price_change_24h
@@ -270,13 +280,7 @@ class Dashboard:
 
         # 成交额（ScanResult 特有）
         if hasattr(best_candidate, 'volume_24h'):
-            volume = best_candidate.volume_24h
-            if volume >= 100000000:
-                vol_str = f"{volume / 100000000:.2f} 亿 USDT"
-            elif volume >= 1000000:
-                vol_str = f"{volume / 1000000:.2f} 万 USDT"
-            else:
-                vol_str = f"{volume:.2f} USDT"
+            vol_str = _format_volume(best_candidate.volume_24h, "USDT")
             print(f"      24H 成交额: {vol_str}")
 
         # 综合评分（ScanResult 特有）
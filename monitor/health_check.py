@@ -60,12 +60,13 @@ class HealthChecker:
 
         # 更新健康状态
         self.component_health = health_status
+        overall = all(health_status.values())
 
         # 记录历史
         self.check_history.append({
             "timestamp": self.last_check_time.isoformat(),
             "health": health_status,
-            "overall": all(health_status.values()),
+            "overall": overall,
         })
 
         if len(self.check_history) > 100:
@@ -73,12 +74,13 @@ class HealthChecker:
 
         # 发布健康检查事件
         if self.event_bus:
-            await self.event_bus.publish(
+            # 心跳只是通知，不等待订阅者处理
+            self.event_bus.post(
                 Event(
                     event_type=EventType.HEARTBEAT,
                     data={
                         "health": health_status,
-                        "overall": all(health_status.values()),
+                        "overall": overall,
                     },
                 )
             )
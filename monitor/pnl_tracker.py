@@ -74,5 +74,5 @@ class PnLTracker:
         """
         # 这里可以根据 position 信息更新 PnL
         # 暂时留空，实际需要实现详细的 PnL 计算
-        self.logger.debug(f"Updating PnL for position: {position}")
+        self.logger.debug("Updating PnL for position: %s", position)
         pass
\ No newline at end of file
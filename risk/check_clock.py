@@ -0,0 +1,30 @@
+"""
+⏱️ 风控检查时钟
+各防护模块共用的检查时间记录（单调时钟）
+"""
+
+from datetime import datetime, timedelta
+from typing import Optional
+import time
+
+
+class CheckClockMixin:
+    """
+    检查时间记录混入类
+
+    检查时间以单调时钟记录（不受系统校时影响），
+    last_check_time 仅在展示时换算为墙钟时间
+    """
+
+    _last_check_monotonic: Optional[float] = None
+
+    def _mark_checked(self):
+        """记录本次检查时间"""
+        self._last_check_monotonic = time.monotonic()
+
+    @property
+    def last_check_time(self) -> Optional[datetime]:
+        """上次检查时间（展示用，由单调时钟换算为墙钟时间）"""
+        if self._last_check_monotonic is None:
+            return None
+        return datetime.now() - timedelta(seconds=time.monotonic() - self._last_check_monotonic)
@@ -3,6 +3,7 @@
 资金再平衡 / 自动补保证金 / 利润提取
 """
 
+import asyncio
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional, List
@@ -11,7 +12,9 @@ import logging
 from core.context import Context
 from exchange.okx_client import OKXClient
 
-@dataclass
+from .check_clock import CheckClockMixin
+
+@dataclass(slots=True, frozen=True)
 class TransferRecord:
     """资金划转记录"""
     timestamp: datetime
@@ -21,7 +24,7 @@ class TransferRecord:
     currency: str
     reason: str
 
-class FundGuard:
+class FundGuard(CheckClockMixin):
     """
     资金防护类
     核心功能：监控保证金率，自动在 资金账户 <-> 交易账户 之间划转 USDT
@@ -44,10 +47,14 @@ class FundGuard:
         # 限制
         self.transfer_threshold = float(guard_cfg.get("transfer_threshold", 50.0)) # 最小划转金额
         self.max_transfer_per_day = float(guard_cfg.get("max_transfer_per_day", 10000.0))
+        self.transfer_max_retries = int(guard_cfg.get("transfer_max_retries", 3))
+        self.transfer_retry_delay = float(guard_cfg.get("transfer_retry_delay", 1.0))
+
+        # 划转串行化：调度任务重叠时避免并发打到 OKX 触发 429
+        self._transfer_lock = asyncio.Semaphore(1)
 
         # 状态
         self.transfers: List[TransferRecord] = []
-        self.last_check_time: Optional[datetime] = None
 
     def set_client(self, client: OKXClient):
         """依赖注入"""
@@ -66,7 +73,7 @@ class FundGuard:
         if ratio <= 0:
             return # 数据未就绪
 
-        self.last_check_time = datetime.now()
+        self._mark_checked()
 
         # 获取账户总权益 (用于计算金额)
         # 假设我们只关心 USDT
@@ -92,7 +99,8 @@ class FundGuard:
                 transfer_amount = self.transfer_threshold
 
             # 检查资金账户余额
-            funding_bals = await self.client.get_funding_balances("USDT")
+            async with self._transfer_lock:
+                funding_bals = await self.client.get_funding_balances("USDT")
             avail_funding = 0.0
             if funding_bals:
                 for b in funding_bals:
@@ -102,7 +110,7 @@ class FundGuard:
             # 执行划转
             real_transfer = min(transfer_amount, avail_funding)
             if real_transfer > 1.0: # 至少转1块钱
-                success = await self.client.transfer_funds("USDT", real_transfer, "6", "18") # 6->18
+                success = await self._transfer("USDT", real_transfer, "6", "18") # 6->18
                 if success:
                     self._record_transfer("funding", "trading", real_transfer, "Margin Top-up")
                 else:
@@ -127,10 +135,24 @@ class FundGuard:
 
                 real_transfer = min(transfer_amount, avail_trading)
                 if real_transfer > 1.0:
-                    success = await self.client.transfer_funds("USDT", real_transfer, "18", "6") # 18->6
+                    success = await self._transfer("USDT", real_transfer, "18", "6") # 18->6
                     if success:
                         self._record_transfer("trading", "funding", real_transfer, "Profit Take")
 
+    async def _transfer(self, ccy: str, amount: float, from_type: str, to_type: str):
+        """串行执行划转，失败时指数退避重试"""
+        delay = self.transfer_retry_delay
+        async with self._transfer_lock:
+            for attempt in range(self.transfer_max_retries):
+                result = await self.client.transfer_funds(ccy, amount, from_type, to_type)
+                if result:
+                    return result
+                if attempt < self.transfer_max_retries - 1:
+                    self.logger.warning(f"⏳ 划转失败，{delay:.1f}s 后重试 ({attempt + 1}/{self.transfer_max_retries})")
+                    await asyncio.sleep(delay)
+                    delay *= 2
+        return None
+
     def _record_transfer(self, from_acc, to_acc, amount, reason):
         rec = TransferRecord(datetime.now(), from_acc, to_acc, amount, "USDT", reason)
         self.transfers.append(rec)
@@ -0,0 +1,47 @@
+"""
+🔥 强平价格估算
+简化公式：按杠杆 + 维持保证金率估算多 / 空强平价
+"""
+
+from functools import lru_cache
+
+# 默认维持保证金率 0.5%
+DEFAULT_MAINTENANCE_MARGIN_RATE = 0.005
+
+
+@lru_cache(maxsize=128)
+def _long_factor(leverage: float, maintenance_margin_rate: float) -> float:
+    """做多强平系数：1 - 1/杠杆 + 维持保证金率"""
+    return 1.0 - 1.0 / leverage + maintenance_margin_rate
+
+
+@lru_cache(maxsize=128)
+def _short_factor(leverage: float, maintenance_margin_rate: float) -> float:
+    """做空强平系数：1 + 1/杠杆 - 维持保证金率"""
+    return 1.0 + 1.0 / leverage - maintenance_margin_rate
+
+
+def estimate_long_liquidation(
+    avg_price,
+    leverage: float,
+    maintenance_margin_rate: float = DEFAULT_MAINTENANCE_MARGIN_RATE,
+):
+    """
+    估算做多强平价
+
+    avg_price 可以是标量，也可以是 np.ndarray（批量估算所有持仓）
+    """
+    return avg_price * _long_factor(leverage, maintenance_margin_rate)
+
+
+def estimate_short_liquidation(
+    avg_price,
+    leverage: float,
+    maintenance_margin_rate: float = DEFAULT_MAINTENANCE_MARGIN_RATE,
+):
+    """
+    估算做空强平价
+
+    avg_price 可以是标量，也可以是 np.ndarray（批量估算所有持仓）
+    """
+    return avg_price * _short_factor(leverage, maintenance_margin_rate)
@@ -3,16 +3,21 @@
 深度 / 滑点 / 插针检测
 """
 
+import math
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime
+from itertools import product
 from typing import Optional, Dict
 import logging
 
 from core.events import EventType
 from core.context import Context, MarketData
 
+from .check_clock import CheckClockMixin
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class LiquidityCheckResult:
     """流动性检查结果"""
 
@@ -22,7 +27,41 @@ class LiquidityCheckResult:
     message: str  # 消息
 
 
-class LiquidityGuard:
+class _RunningStats:
+    """深度窗口统计（滑动窗口 Welford 均值 / 方差，O(1) 更新与读取）"""
+
+    __slots__ = ("n", "mean", "m2")
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, x: float, evicted: Optional[float] = None):
+        """加入新样本；evicted 为同时被挤出窗口的旧样本（窗口未满时为 None）"""
+        if evicted is None:
+            self.n += 1
+            delta = x - self.mean
+            self.mean += delta / self.n
+            self.m2 += delta * (x - self.mean)
+            return
+
+        # 窗口已满：样本数不变，用新样本替换旧样本
+        old_mean = self.mean
+        self.mean += (x - evicted) / self.n
+        # 浮点误差可能让 m2 略小于 0，截断
+        self.m2 = max(self.m2 + (x - evicted) * (x - self.mean + evicted - old_mean), 0.0)
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+
+class LiquidityGuard(CheckClockMixin):
     """
     流动性防护类
     检测市场深度和滑点
@@ -38,22 +77,30 @@ class LiquidityGuard:
         self.logger = logging.getLogger(__name__)
 
         # 状态追踪
-        self.last_check_time: Optional[datetime] = None
-        self.depth_history: Dict[str, list] = {}  # {symbol: [depth_values]}
+        self.depth_history: Dict[str, deque] = {}  # {symbol: 最近 100 个深度值}
+        self.depth_stats: Dict[str, _RunningStats] = {}  # {symbol: 最近 100 个深度值的统计}
+
+        # 消息模板：(depth_ok, slippage_ok, volume_ok) -> 格式化函数
+        self._msg_by_mask = self._build_message_templates()
 
     async def check(
         self,
         symbol: str,
         order_quantity: float,
         context: Context,
+        strict: bool = False,
     ) -> LiquidityCheckResult:
         """
         检查流动性是否充足
 
+        默认在第一个不通过的检查处短路，后续检查不再计算；
+        strict=True 时执行全部检查（事后复盘用）
+
         Args:
             symbol: 交易品种
             order_quantity: 订单数量
             context: 上下文
+            strict: 是否执行完整审计
 
         Returns:
             LiquidityCheckResult: 检查结果
@@ -72,22 +119,24 @@ class LiquidityGuard:
         depth_value = self._calculate_depth(market_data)
         depth_adequate = depth_value >= self.min_depth_threshold
 
-        # 计算预估滑点
-        estimated_slippage = self._estimate_slippage(market_data, order_quantity)
-        slippage_ok = estimated_slippage <= self.max_slippage_ratio
+        estimated_slippage = 0.0
+        slippage_ok = False
+        volume_ok = False
+
+        if depth_adequate or strict:
+            # 计算预估滑点
+            estimated_slippage = self._estimate_slippage(market_data, order_quantity)
+            slippage_ok = estimated_slippage <= self.max_slippage_ratio
 
-        # 检查成交量
-        volume_ok = await self._check_volume(market_data)
+            if slippage_ok or strict:
+                # 检查成交量
+                volume_ok = self._check_volume(market_data)
 
         # 综合判断
         is_adequate = depth_adequate and slippage_ok and volume_ok
 
         # 记录深度历史
-        if symbol not in self.depth_history:
-            self.depth_history[symbol] = []
-        self.depth_history[symbol].append(depth_value)
-        if len(self.depth_history[symbol]) > 100:
-            self.depth_history[symbol].pop(0)
+        self._record_depth(symbol, depth_value)
 
         # 生成消息
         message = self._generate_message(
@@ -99,9 +148,9 @@ class LiquidityGuard:
         )
 
         # 记录检查时间
-        self.last_check_time = datetime.now()
+        self._mark_checked()
 
-        self.logger.info(f"Liquidity check for {symbol}: {message}")
+        self.logger.info("Liquidity check for %s: %s", symbol, message)
 
         return LiquidityCheckResult(
             is_adequate=is_adequate,
@@ -122,7 +171,7 @@ class LiquidityGuard:
         # 检查深度是否满足最小阈值
         depth_ok = context.liquidity_depth >= self.min_depth_threshold
 
-        self.last_check_time = datetime.now()
+        self._mark_checked()
 
         return depth_ok
 
@@ -130,8 +179,8 @@ class LiquidityGuard:
         """计算深度"""
         # 获取买一卖一深度
         depth = market_data.depth
-        bid_depth = depth.get("bid_1_amount", 0) * depth.get("bid_1_price", 0)
-        ask_depth = depth.get("ask_1_amount", 0) * depth.get("ask_1_price", 0)
+        bid_depth = depth.bid_1_amount * depth.bid_1_price
+        ask_depth = depth.ask_1_amount * depth.ask_1_price
 
         # 取较小值
         return min(bid_depth, ask_depth)
@@ -143,8 +192,7 @@ class LiquidityGuard:
     ) -> float:
         """预估滑点"""
         # 简单的滑点估算模型
-        depth = market_data.depth
-        ask_depth = depth.get("ask_1_amount", 0)
+        ask_depth = market_data.depth.ask_1_amount
 
         if ask_depth <= 0:
             return 1.0  # 无深度，100%滑点
@@ -157,11 +205,31 @@ class LiquidityGuard:
 
         return min(slippage, 1.0)
 
-    async def _check_volume(self, market_data: MarketData) -> bool:
+    def _check_volume(self, market_data: MarketData) -> bool:
         """检查成交量"""
         # 简化：假设24h成交量足够
         return market_data.volume_24h > self.min_depth_threshold
 
+    def _build_message_templates(self) -> dict:
+        """预编译消息模板，按检查结果掩码索引"""
+        low_depth = lambda d, s: f"Low liquidity: depth ${d:.2f} < ${self.min_depth_threshold:.2f}"
+        high_slippage = lambda d, s: f"High slippage: {s:.2%} > {self.max_slippage_ratio:.2%}"
+        low_volume = lambda d, s: "Low volume"
+        ok = lambda d, s: f"OK: depth ${d:.2f}, slippage {s:.2%}"
+
+        templates = {}
+        for depth_adequate, slippage_ok, volume_ok in product((False, True), repeat=3):
+            if not depth_adequate:
+                template = low_depth
+            elif not slippage_ok:
+                template = high_slippage
+            elif not volume_ok:
+                template = low_volume
+            else:
+                template = ok
+            templates[(depth_adequate, slippage_ok, volume_ok)] = template
+        return templates
+
     def _generate_message(
         self,
         depth_value: float,
@@ -171,24 +239,38 @@ class LiquidityGuard:
         volume_ok: bool,
     ) -> str:
         """生成消息"""
-        if not depth_adequate:
-            return f"Low liquidity: depth ${depth_value:.2f} < ${self.min_depth_threshold:.2f}"
-        elif not slippage_ok:
-            return f"High slippage: {estimated_slippage:.2%} > {self.max_slippage_ratio:.2%}"
-        elif not volume_ok:
-            return "Low volume"
-        else:
-            return f"OK: depth ${depth_value:.2f}, slippage {estimated_slippage:.2%}"
+        template = self._msg_by_mask[(depth_adequate, slippage_ok, volume_ok)]
+        return template(depth_value, estimated_slippage)
+
+    def _record_depth(self, symbol: str, depth_value: float):
+        """记录深度值（环形缓冲 + 增量统计）"""
+        history = self.depth_history.get(symbol)
+        if history is None:
+            history = self.depth_history[symbol] = deque(maxlen=100)
+            self.depth_stats[symbol] = _RunningStats()
+        # 窗口已满时 append 会挤出最旧的样本，统计随之移出
+        evicted = history[0] if len(history) == history.maxlen else None
+        history.append(depth_value)
+        self.depth_stats[symbol].update(depth_value, evicted)
 
     def get_depth_history(self, symbol: str, limit: int = 20) -> list:
         """获取深度历史"""
         if symbol not in self.depth_history:
             return []
-        return self.depth_history[symbol][-limit:]
+        history = self.depth_history[symbol]
+        return list(history)[-limit:]
+
+    def get_depth_stats(self, symbol: str) -> Dict[str, float]:
+        """获取深度统计（均值 / 标准差 / 样本数）"""
+        stats = self.depth_stats.get(symbol)
+        if stats is None:
+            return {"count": 0, "mean": 0.0, "std": 0.0}
+        return {"count": stats.n, "mean": stats.mean, "std": stats.std}
 
     def reset(self):
         """重置状态"""
         self.depth_history.clear()
+        self.depth_stats.clear()
         self.logger.info("Liquidity guard state reset")
 
     def to_dict(self) -> dict:
@@ -5,14 +5,17 @@
 
 from dataclasses import dataclass
 from datetime import datetime
+from itertools import product
 from typing import Optional
 import logging
 
 from core.events import Event, EventType, RiskEvent
 from core.context import Context
 
+from .check_clock import CheckClockMixin
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class MarginCheckResult:
     """保证金检查结果"""
 
@@ -23,14 +26,15 @@ class MarginCheckResult:
     message: str  # 消息
 
 
-class MarginGuard:
+class MarginGuard(CheckClockMixin):
     """
     保证金防护类
     监控保证金率，防止爆仓
     """
 
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, event_bus=None):
         self.config = config
+        self.event_bus = event_bus
         self.margin_ratio_warning = config.get("margin_ratio_warning", 0.80)
         self.margin_ratio_critical = config.get("margin_ratio_critical", 0.60)
         self.margin_ratio_stop = config.get("margin_ratio_stop", 0.50)
@@ -40,11 +44,13 @@ class MarginGuard:
         self.logger = logging.getLogger(__name__)
 
         # 状态追踪
-        self.last_check_time: Optional[datetime] = None
         self.warning_triggered: bool = False
         self.critical_triggered: bool = False
         self.emergency_triggered: bool = False
 
+        # 消息模板：(is_warning, is_critical, is_emergency) -> 格式化函数
+        self._msg_by_mask = self._build_message_templates()
+
     async def check(self, context: Context) -> MarginCheckResult:
         """
         检查保证金状况
@@ -73,7 +79,7 @@ class MarginGuard:
         )
 
         # 记录检查时间
-        self.last_check_time = datetime.now()
+        self._mark_checked()
 
         # 更新触发状态
         if is_warning:
@@ -83,7 +89,7 @@ class MarginGuard:
         if is_emergency:
             self.emergency_triggered = True
 
-        self.logger.info(f"Margin check: {margin_ratio:.2%} - {result.message}")
+        self.logger.info("Margin check: %.2f%% - %s", margin_ratio * 100, result.message)
 
         return result
 
@@ -97,10 +103,31 @@ class MarginGuard:
         context.margin_ratio = margin_ratio
 
         # 记录检查时间
-        self.last_check_time = datetime.now()
+        self._mark_checked()
 
         return margin_ratio
 
+    @staticmethod
+    def _build_message_templates() -> dict:
+        """预编译消息模板，按风险等级掩码索引"""
+        emergency = lambda r: f"EMERGENCY: Margin ratio at {r:.2%}, immediate action required!"
+        critical = lambda r: f"CRITICAL: Margin ratio at {r:.2%}, action needed"
+        warning = lambda r: f"WARNING: Margin ratio at {r:.2%}, monitor closely"
+        ok = lambda r: f"OK: Margin ratio at {r:.2%}"
+
+        templates = {}
+        for is_warning, is_critical, is_emergency in product((False, True), repeat=3):
+            if is_emergency:
+                template = emergency
+            elif is_critical:
+                template = critical
+            elif is_warning:
+                template = warning
+            else:
+                template = ok
+            templates[(is_warning, is_critical, is_emergency)] = template
+        return templates
+
     def _generate_message(
         self,
         margin_ratio: float,
@@ -109,23 +136,49 @@ class MarginGuard:
         is_emergency: bool,
     ) -> str:
         """生成消息"""
-        if is_emergency:
-            return f"EMERGENCY: Margin ratio at {margin_ratio:.2%}, immediate action required!"
-        elif is_critical:
-            return f"CRITICAL: Margin ratio at {margin_ratio:.2%}, action needed"
-        elif is_warning:
-            return f"WARNING: Margin ratio at {margin_ratio:.2%}, monitor closely"
-        else:
-            return f"OK: Margin ratio at {margin_ratio:.2%}"
+        return self._msg_by_mask[(is_warning, is_critical, is_emergency)](margin_ratio)
+
+    async def _publish_risk_event(
+        self,
+        event_type: EventType,
+        level: str,
+        margin_ratio: float,
+        threshold: float,
+    ):
+        """发布风险事件（每次新建不可变事件，订阅者可安全持有）"""
+        if not self.event_bus:
+            return
+
+        event = RiskEvent(
+            event_type=event_type,
+            risk_type="margin",
+            level=level,
+            current_value=margin_ratio,
+            threshold=threshold,
+            message=self._generate_message(
+                margin_ratio,
+                margin_ratio <= self.margin_ratio_warning,
+                margin_ratio <= self.margin_ratio_critical,
+                margin_ratio <= self.margin_ratio_stop,
+            ),
+        )
+
+        await self.event_bus.publish(event)
 
     async def handle_warning(self, context: Context):
         """处理警告"""
         self.logger.warning(f"Margin warning triggered: {context.margin_ratio:.2%}")
         # 可以发送通知或采取轻微措施
+        await self._publish_risk_event(
+            EventType.MARGIN_WARNING, "warning", context.margin_ratio, self.margin_ratio_warning
+        )
 
     async def handle_critical(self, context: Context):
         """处理危险情况"""
         self.logger.critical(f"Margin critical: {context.margin_ratio:.2%}")
+        await self._publish_risk_event(
+            EventType.MARGIN_CRITICAL, "critical", context.margin_ratio, self.margin_ratio_critical
+        )
 
         if self.auto_add_margin:
             # 触发资金再平衡
@@ -137,6 +190,9 @@ class MarginGuard:
 
         # 设置紧急状态
         context.is_emergency = True
+        await self._publish_risk_event(
+            EventType.RISK_TRIGGERED, "emergency", context.margin_ratio, self.margin_ratio_stop
+        )
 
         if self.auto_reduce_position:
             # 触发减仓或平仓
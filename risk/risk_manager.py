@@ -5,8 +5,9 @@
 """
 
 import logging
+import time
 from typing import Dict, Optional
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
 from core.context import Context
 from core.events import EventType, RiskEvent
@@ -47,6 +48,12 @@ class RiskManager:
         self.circuit_breaker = circuit_breaker
         self.exchange_guard = exchange_guard
 
+        # 同步快速拒绝门：(判定函数, 拒绝原因)，依次检查，命中即拒绝
+        self._gates = (
+            (self.circuit_breaker.is_triggered, "Circuit breaker triggered"),
+            (lambda: not self.exchange_guard.is_healthy(), "Exchange connection unstable"),
+        )
+
         # 风控配置
         self.max_position_risk = config.get("max_position_risk", 0.10)  # 单笔最大风险 10%
         self.max_total_risk = config.get("max_total_risk", 0.30)  # 总风险 30%
@@ -56,15 +63,17 @@ class RiskManager:
         self.daily_trades = 0
         self.daily_loss = 0.0
         self.last_reset_date = datetime.now().date()
+        self._next_reset_ts = self._next_midnight_ts(self.last_reset_date)
 
         self.logger.info("✅ RiskManager 初始化完成")
 
-    async def check_order(self, signal: Dict) -> Dict:
+    async def check_order(self, signal: Dict, context: Optional[Context] = None) -> Dict:
         """
         核心方法：审批交易信号
 
         Args:
             signal: 交易信号，包含 symbol, side, size, leverage 等
+            context: 上下文（可选）。传入时执行保证金 / 流动性检查
 
         Returns:
             {
@@ -74,39 +83,47 @@ class RiskManager:
             }
         """
         try:
-            self.logger.info(f"🛡️ [风控] 审批信号: {signal.get('symbol')} {signal.get('side')} {signal.get('size')}")
-
-            # 1. 全局熔断检查
-            if self.circuit_breaker.is_triggered():
-                return {
-                    "approved": False,
-                    "modified_size": 0,
-                    "reason": "Circuit breaker triggered"
-                }
-
-            # 2. 交易所连接检查
-            if not self.exchange_guard.is_healthy():
-                return {
-                    "approved": False,
-                    "modified_size": 0,
-                    "reason": "Exchange connection unstable"
-                }
-
-            # 3. 流动性检查（如果需要）
-            # symbol = signal.get("symbol")
-            # liquidity_check = await self.liquidity_guard.check_depth(symbol, signal.get("size"))
-            # if not liquidity_check["ok"]:
-            #     return {
-            #         "approved": False,
-            #         "modified_size": 0,
-            #         "reason": f"Insufficient liquidity: {liquidity_check['reason']}"
-            #     }
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(
+                    "🛡️ [风控] 审批信号: %s %s %s",
+                    signal.get("symbol"), signal.get("side"), signal.get("size"),
+                )
+
+            # 1-2. 全局熔断 / 交易所连接检查
+            for predicate, reason in self._gates:
+                if predicate():
+                    return {
+                        "approved": False,
+                        "modified_size": 0,
+                        "reason": reason
+                    }
+
+            # 3. 保证金 + 流动性检查
+            if context is not None:
+                # 保证金检查只读 Context、不做 I/O，直接计算，紧急时无需再查盘口
+                margin_result = await self.margin_guard.check(context)
+                if margin_result.is_emergency:
+                    return {
+                        "approved": False,
+                        "modified_size": 0,
+                        "reason": f"Margin emergency: {margin_result.message}"
+                    }
+
+                liquidity_result = await self.liquidity_guard.check(
+                    signal.get("symbol"), float(signal.get("size", 0)), context
+                )
+                if not liquidity_result.is_adequate:
+                    return {
+                        "approved": False,
+                        "modified_size": 0,
+                        "reason": f"Insufficient liquidity: {liquidity_result.message}"
+                    }
 
             # 4. 仓位数量检查
             # context 需要从外部注入，这里暂时跳过
 
             # 5. 通过审批
-            self.logger.info(f"✅ [风控] 审批通过")
+            self.logger.info("✅ [风控] 审批通过")
             return {
                 "approved": True,
                 "modified_size": float(signal.get("size", 0)),
@@ -114,20 +131,18 @@ class RiskManager:
             }
 
         except Exception as e:
-            self.logger.error(f"❌ [风控] 审批异常: {e}")
-            import traceback
-            traceback.print_exc()
+            self.logger.exception("❌ [风控] 审批异常: %s", e)
             return {
                 "approved": False,
                 "modified_size": 0,
                 "reason": f"Risk check error: {str(e)}"
             }
 
-    async def approve(self, signal: Dict) -> Dict:
+    async def approve(self, signal: Dict, context: Optional[Context] = None) -> Dict:
         """
         备用方法：审批交易信号（与 check_order 功能相同）
         """
-        return await self.check_order(signal)
+        return await self.check_order(signal, context)
 
     async def check_margin_ratio(self, context: Context) -> MarginCheckResult:
         """
@@ -161,9 +176,8 @@ class RiskManager:
         if pnl < 0:
             self.daily_loss += abs(pnl)
 
-        # 检查是否需要重置
-        now = datetime.now().date()
-        if now != self.last_reset_date:
+        # 检查是否需要重置（与预先算好的次日零点时间戳比较，不构造 date 对象）
+        if time.time() >= self._next_reset_ts:
             self.reset_daily_stats()
 
     def reset_daily_stats(self):
@@ -171,8 +185,14 @@ class RiskManager:
         self.daily_trades = 0
         self.daily_loss = 0.0
         self.last_reset_date = datetime.now().date()
+        self._next_reset_ts = self._next_midnight_ts(self.last_reset_date)
         self.logger.info("🔄 [风控] 每日统计已重置")
 
+    @staticmethod
+    def _next_midnight_ts(day: date) -> float:
+        """返回 day 次日本地零点的 Unix 时间戳"""
+        return datetime.combine(day + timedelta(days=1), datetime.min.time()).timestamp()
+
     def get_stats(self) -> Dict:
         """获取风控统计"""
         return {
@@ -0,0 +1,243 @@
+"""
+🕯️ K 线缓存
+=============
+WebSocket candle 频道推送 → 每个品种一块预分配的 float64 环形缓冲
+扫描器优先读缓存，未命中再走 REST
+"""
+
+import asyncio
+import json
+import logging
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+import aiohttp
+import numpy as np
+
+from strategy.indicators import KLINE_COLUMNS, klines_to_ndarray
+
+# 可选：orjson 解析推送，未安装时使用标准库
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+# OKX 业务频道（candle 系列推送在 business 端点）
+DEFAULT_WS_URL = "wss://ws.okx.com:8443/ws/v5/business"
+
+# 缓冲列顺序：[ts, open, high, low, close, volume]
+KLINE_FIELDS = len(KLINE_COLUMNS)
+
+
+class _KlineRing:
+    """
+    单品种 K 线环形缓冲
+
+    双倍长度镜像写入：任意时刻最近 count 根 K 线都是一段连续切片，读取无需拼接
+    """
+
+    __slots__ = ("limit", "buf", "pos", "count")
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.buf = np.zeros((2 * limit, KLINE_FIELDS), dtype=np.float64)
+        self.pos = 0  # 下一次写入位置 [0, limit)
+        self.count = 0
+
+    def _write(self, idx: int, row):
+        self.buf[idx] = row
+        self.buf[idx + self.limit] = row
+
+    def last_ts(self) -> float:
+        return self.buf[self.limit + self.pos - 1, 0] if self.count else -1.0
+
+    def push(self, row):
+        """追加或覆盖最新一根（同一时间戳视为未收盘 K 线的更新）"""
+        ts = row[0]
+        last_ts = self.last_ts()
+        if self.count and ts == last_ts:
+            self._write((self.pos - 1) % self.limit, row)
+        elif ts > last_ts:
+            self._write(self.pos, row)
+            self.pos = (self.pos + 1) % self.limit
+            self.count = min(self.count + 1, self.limit)
+        # 更早的推送直接忽略
+
+    def window(self) -> np.ndarray:
+        """按时间升序的最近 count 根 K 线（视图）"""
+        end = self.limit + self.pos
+        return self.buf[end - self.count:end]
+
+
+def _parse_row(raw) -> Tuple[float, ...]:
+    """OKX K 线行（字符串列表）→ (ts, o, h, l, c, vol)"""
+    return (
+        float(raw[0]), float(raw[1]), float(raw[2]),
+        float(raw[3]), float(raw[4]), float(raw[5]),
+    )
+
+
+class KlineCache:
+    """
+    K 线缓存
+
+    按 (symbol, bar) 保存环形缓冲；只有被 WebSocket 订阅的品种才会写入，
+    避免缓存中出现不再更新的陈旧数据
+    """
+
+    def __init__(self, limit: int = 100):
+        self.limit = limit
+        self._rings: Dict[Tuple[str, str], _KlineRing] = {}
+
+    def seed(self, symbol: str, bar: str, klines) -> None:
+        """用 REST 返回的 K 线（OKX 为最新在前，列表或数组均可）初始化缓冲"""
+        arr = klines_to_ndarray(klines)
+        arr = arr[np.argsort(arr[:, 0], kind="stable")][-self.limit:]
+        ring = _KlineRing(self.limit)
+        for row in arr:
+            ring.push(row)
+        self._rings[(symbol, bar)] = ring
+
+    def update(self, symbol: str, bar: str, raw) -> None:
+        """写入一条 WebSocket 推送；未初始化的品种等待 REST 补齐后再接收"""
+        ring = self._rings.get((symbol, bar))
+        if ring is not None:
+            ring.push(_parse_row(raw))
+
+    def get(self, symbol: str, bar: str, limit: int) -> Optional[np.ndarray]:
+        """
+        读取最近 limit 根 K 线，(limit, 6) float64 数组，顺序与 REST 一致（最新在前）
+
+        返回副本：排队等待分析期间缓冲仍可能被推送覆盖
+
+        Returns:
+            缓存不足 limit 根时返回 None，由调用方回退 REST
+        """
+        ring = self._rings.get((symbol, bar))
+        if ring is None or ring.count < limit:
+            return None
+        return ring.window()[-limit:][::-1].copy()
+
+    def discard(self, symbols: Iterable[str], bar: str) -> None:
+        for symbol in symbols:
+            self._rings.pop((symbol, bar), None)
+
+    def clear(self) -> None:
+        self._rings.clear()
+
+
+class KlineStream:
+    """
+    K 线 WebSocket 订阅器
+
+    后台任务维持一条连接，断线自动重连；断线期间丢弃缓存，扫描器回退 REST
+    """
+
+    def __init__(
+        self,
+        cache: KlineCache,
+        bar: str = "4H",
+        url: str = DEFAULT_WS_URL,
+        proxy: Optional[str] = None,
+        reconnect_delay: float = 5.0,
+        ping_interval: float = 25.0,
+    ):
+        self.cache = cache
+        self.bar = bar
+        self.channel = f"candle{bar}"
+        self.url = url
+        self.proxy = proxy
+        self.reconnect_delay = reconnect_delay
+        self.ping_interval = ping_interval
+
+        self.symbols: Set[str] = set()
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._task: Optional[asyncio.Task] = None
+        self.logger = logger
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def is_live(self, symbol: str) -> bool:
+        """品种已订阅且连接正常，此时缓存会持续更新"""
+        return self._ws is not None and not self._ws.closed and symbol in self.symbols
+
+    async def set_symbols(self, symbols: Iterable[str]):
+        """更新订阅列表（增量订阅 / 退订），首次调用时启动后台任务"""
+        new_symbols = set(symbols)
+        added = new_symbols - self.symbols
+        removed = self.symbols - new_symbols
+        self.symbols = new_symbols
+        self.cache.discard(removed, self.bar)
+
+        if not self.is_running:
+            self._task = asyncio.create_task(self._run())
+            return
+
+        if self._ws is not None and not self._ws.closed:
+            if removed:
+                await self._send("unsubscribe", removed)
+            if added:
+                await self._send("subscribe", added)
+
+    def close(self):
+        """停止后台任务（连接在任务退出时关闭）"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self.cache.discard(self.symbols, self.bar)
+
+    async def _send(self, op: str, symbols: Iterable[str]):
+        args = [{"channel": self.channel, "instId": s} for s in symbols]
+        await self._ws.send_str(json.dumps({"op": op, "args": args}))
+
+    async def _run(self):
+        while True:
+            try:
+                async with aiohttp.ClientSession() as session:
+                    async with session.ws_connect(self.url, proxy=self.proxy) as ws:
+                        self._ws = ws
+                        if self.symbols:
+                            await self._send("subscribe", self.symbols)
+                        self.logger.info(f"✅ K线 WebSocket 已连接，订阅 {len(self.symbols)} 个品种")
+                        await self._consume(ws)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.warning(f"⚠️ K线 WebSocket 异常: {e}")
+            finally:
+                self._ws = None
+                # 断线期间的推送已丢失，丢弃缓存等待 REST 重新补齐
+                self.cache.discard(self.symbols, self.bar)
+
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def _consume(self, ws: aiohttp.ClientWebSocketResponse):
+        while True:
+            try:
+                msg = await ws.receive(timeout=self.ping_interval)
+            except asyncio.TimeoutError:
+                # 空闲时发送心跳，避免服务端 30 秒断开
+                await ws.send_str("ping")
+                continue
+
+            if msg.type != aiohttp.WSMsgType.TEXT:
+                if msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                    return
+                continue
+            if msg.data == "pong":
+                continue
+
+            payload = _json_loads(msg.data)
+            if payload.get("event") == "error":
+                self.logger.error(f"❌ K线订阅失败: {payload.get('msg')}")
+                continue
+
+            data = payload.get("data")
+            if not data:
+                continue
+            symbol = payload.get("arg", {}).get("instId")
+            for raw in data:
+                self.cache.update(symbol, self.bar, raw)
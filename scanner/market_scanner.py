@@ -7,19 +7,89 @@
 3. 生成候选列表
 """
 import asyncio
+import heapq
 import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
+from collections import OrderedDict
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 
-from strategy.indicators import normalize_klines, calculate_atr
+from core.jit import njit, prange
+from scanner.kline_cache import DEFAULT_WS_URL, KlineCache, KlineStream
+from strategy.indicators import klines_to_ndarray, normalize_klines, calculate_atr
 from strategy.regime_detector import RegimeAnalysis
 
 logger = logging.getLogger(__name__)
 
-
-@dataclass
+# 市场环境评分：TREND 适合策略 / RANGE 也适合 / CHAOS 不适合（唯一数据源）
+_REGIME_SCORE = {"TREND": 0.9, "RANGE": 0.7, "CHAOS": 0.3}
+# 由上表派生：评分内核使用整数编码查表，未知环境按 CHAOS 处理
+_REGIME_CODES = {regime: code for code, regime in enumerate(_REGIME_SCORE)}
+_REGIME_CHAOS = _REGIME_CODES["CHAOS"]
+_REGIME_SCORES = np.array(list(_REGIME_SCORE.values()))
+# 除成交额外其余维度的满分之和（涨跌幅 20 + 环境 30 × 最高环境分 + 波动率 20）
+_NON_VOLUME_MAX_SCORE = 20 + 30 * float(_REGIME_SCORES.max()) + 20
+
+
+@njit(cache=True)
+def _score_kernel(volume_24h, price_change_24h, regime_code, confidence, atr_expansion):
+    """单个候选的综合评分（0-100），分段线性"""
+    score = 0.0
+
+    # 1. 成交额评分（归一化，1 亿 USDT 满分）
+    volume_score = volume_24h / 100000000
+    if volume_score > 1.0:
+        volume_score = 1.0
+    score += volume_score * 30
+
+    # 2. 涨跌幅评分（理想涨跌幅：3% - 10%）
+    change = abs(price_change_24h)
+    if 3 <= change <= 10:
+        change_score = 1.0
+    elif change < 3:
+        change_score = change / 3
+    else:
+        change_score = 1 - (change - 10) / 10
+        if not change_score > 0:
+            change_score = 0.0
+    score += change_score * 20
+
+    # 3. 市场环境评分
+    score += _REGIME_SCORES[regime_code] * confidence * 30
+
+    # 4. 波动率评分（理想 ATR 扩张：1.0 - 1.5）
+    if 1.0 <= atr_expansion <= 1.5:
+        volatility_score = 1.0
+    elif atr_expansion < 1.0:
+        volatility_score = atr_expansion
+    else:
+        volatility_score = 1 - (atr_expansion - 1.5) / 1.5
+        if not volatility_score > 0:
+            volatility_score = 0.0
+    score += volatility_score * 20
+
+    if score > 100.0:
+        score = 100.0
+    return score
+
+
+@njit(cache=True, parallel=True)
+def _score_kernel_batch(volume_24h, price_change_24h, regime_code, confidence, atr_expansion):
+    """批量评分：一次调用为所有候选打分"""
+    n = volume_24h.shape[0]
+    scores = np.empty(n)
+    for i in prange(n):
+        scores[i] = _score_kernel(
+            volume_24h[i], price_change_24h[i], regime_code[i], confidence[i], atr_expansion[i]
+        )
+    return scores
+
+
+@dataclass(slots=True)
 class ScanResult:
     """扫描结果"""
 
@@ -53,6 +123,91 @@ class ScanResult:
         }
 
 
+def _column(rows: List[Dict], key: str) -> np.ndarray:
+    """把 dict 列表中的某个字段解析为 float64 数组，无法解析的值为 NaN"""
+    return pd.to_numeric(
+        pd.Series([row.get(key, 0) for row in rows], dtype=object), errors="coerce"
+    ).to_numpy(dtype=np.float64)
+
+
+# 淘汰原因 -> 统计日志中的说明（按输出顺序）
+_FILTER_REJECT_LABELS = (
+    ("low_volume", "成交额过低"),
+    ("low_volatility", "涨跌幅过低"),
+    ("high_volatility", "涨跌幅过高"),
+    ("error", "错误"),
+)
+_ANALYZE_REJECT_LABELS = (
+    ("no_klines", "K线数据不足"),
+    ("no_regime", "市场环境分析失败"),
+    ("not_trend", "非趋势环境"),
+    ("low_adx", "ADX过低"),
+    ("low_atr", "ATR扩张过低"),
+    ("timeout", "K线请求超时"),
+    ("error", "分析错误"),
+    ("skipped", "提前结束未分析"),
+)
+
+
+class _LRUCache:
+    """定长 LRU 缓存（超出容量时淘汰最久未使用的条目）"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+
+    def get(self, key):
+        value = self._data.get(key)
+        if value is not None:
+            self._data.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+
+
+class _AsyncTTLCache:
+    """
+    异步 TTL 缓存
+
+    未过期直接返回缓存值；未命中时加锁加载，避免并发扫描重复请求同一数据
+    """
+
+    def __init__(self):
+        self._data: Dict = {}  # {key: (过期时间, 值)}
+        self._lock = asyncio.Lock()
+
+    async def get_or_load(self, key, ttl: float, loader):
+        entry = self._data.get(key)
+        if entry and time.monotonic() < entry[0]:
+            return entry[1]
+
+        async with self._lock:
+            # 等锁期间可能已被其他协程刷新
+            now = time.monotonic()
+            entry = self._data.get(key)
+            if entry and now < entry[0]:
+                return entry[1]
+
+            value = await loader()
+            if value:
+                # 顺带清理过期条目，防止 key 无限增长
+                self._data = {k: v for k, v in self._data.items() if now < v[0]}
+                self._data[key] = (time.monotonic() + ttl, value)
+            return value
+
+    def clear(self):
+        self._data.clear()
+
+
 class MarketScanner:
     """
     市场扫描器
@@ -95,7 +250,35 @@ class MarketScanner:
         self.min_adx = config.get("min_adx", 25)
         self.min_atr_expansion = config.get("min_atr_expansion", 1.2)
 
-        self.logger = logging.getLogger(__name__)
+        # 并发配置（K 线拉取为 I/O 密集，提高并发以重叠网络延迟）
+        self.max_concurrency = config.get("max_concurrency", 32)
+        self.queue_size = config.get("queue_size", 64)
+        self.kline_timeout = config.get("kline_timeout", 10)
+        # 环境分析进程池（默认 0：在事件循环内直接计算）
+        # 单次 ~100 根 K 线的分析比跨进程序列化检测器更便宜，且子进程无法复用 numba 预热，只在需要时显式开启
+        self.analysis_workers = config.get("analysis_workers", 0)
+        # 提前结束：已确认的前 N 名不可能被剩余（成交额更低的）品种超越时停止拉取
+        self.early_exit = config.get("early_exit", True)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+        # 缓存配置（品种列表变化很慢，Ticker 需要较新）
+        self.ttl_instruments = config.get("ttl_instruments", 300)
+        self.ttl_tickers = config.get("ttl_tickers", 5)
+        self._cache = _AsyncTTLCache()
+        self._session_checked = False
+
+        # K 线 WebSocket 缓存（订阅成交额靠前的品种，命中时省去 REST 往返）
+        self.kline_limit = 100
+        self.ws_klines = config.get("ws_klines", False)
+        self.ws_kline_symbols = config.get("ws_kline_symbols", 50)
+        self.ws_url = config.get("ws_url", DEFAULT_WS_URL)
+        self.kline_cache = KlineCache(limit=self.kline_limit)
+        self._kline_stream: Optional[KlineStream] = None
+
+        # 环境分析记忆化：按 (品种, 最新 K 线时间戳) 缓存，同一根 K 线未收盘前不重复计算
+        self._regime_cache = _LRUCache(config.get("regime_cache_size", 2048))
+
+        self.logger = logger
 
     async def scan(self) -> List[ScanResult]:
         """
@@ -104,18 +287,22 @@ class MarketScanner:
         Returns:
             List[ScanResult]: 扫描结果列表（按评分排序）
         """
-        self.logger.info("=" * 80)
-        self.logger.info("🔍 开始市场扫描...")
-        self.logger.info("=" * 80)
-        self.logger.info(f"📋 扫描配置:")
-        self.logger.info(f"   - 返回数量: {self.top_n}")
-        self.logger.info(f"   - 最小成交额: {self.min_volume_24h:,} USDT")
-        self.logger.info(f"   - 涨跌幅范围: {self.min_price_change}% ~ {self.max_price_change}%")
-        self.logger.info(f"   - 趋势筛选: {'开启' if self.trend_only else '关闭'}")
+        # 横幅拼成一条记录输出，只获取一次 handler 锁
+        lines = [
+            "=" * 80,
+            "🔍 开始市场扫描...",
+            "=" * 80,
+            "📋 扫描配置:",
+            f"   - 返回数量: {self.top_n}",
+            f"   - 最小成交额: {self.min_volume_24h:,} USDT",
+            f"   - 涨跌幅范围: {self.min_price_change}% ~ {self.max_price_change}%",
+            f"   - 趋势筛选: {'开启' if self.trend_only else '关闭'}",
+        ]
         if self.trend_only:
-            self.logger.info(f"   - 最小ADX: {self.min_adx}")
-            self.logger.info(f"   - 最小ATR扩张: {self.min_atr_expansion}")
-        self.logger.info("-" * 80)
+            lines.append(f"   - 最小ADX: {self.min_adx}")
+            lines.append(f"   - 最小ATR扩张: {self.min_atr_expansion}")
+        lines.append("-" * 80)
+        self.logger.info("\n".join(lines))
 
         try:
             # 1. 获取所有 USDT 永续合约
@@ -127,6 +314,7 @@ class MarketScanner:
                 return []
 
             self.logger.info(f"✅ 获取到 {len(instruments)} 个 USDT 永续合约")
+            self._check_client_session()
 
             # 2. 获取每个品种的 Ticker 数据
             self.logger.info("📡 步骤2: 获取Ticker数据...")
@@ -149,6 +337,9 @@ class MarketScanner:
 
             self.logger.info(f"✅ 初筛后候选品种数量: {len(filtered_tickers)}")
 
+            if self.ws_klines:
+                await self._update_kline_stream(filtered_tickers)
+
             # 4. 对每个候选品种进行技术分析（获取 K 线并计算指标）
             self.logger.info("🔍 步骤4: 技术分析（趋势筛选）...")
             candidates = await self._analyze_candidates(filtered_tickers)
@@ -160,8 +351,7 @@ class MarketScanner:
 
             # 5. 排序并返回前 N 个
             self.logger.info("📊 步骤5: 排序并选择前 N 个...")
-            sorted_candidates = sorted(candidates, key=lambda x: x.score, reverse=True)
-            final_candidates = sorted_candidates[:self.top_n]
+            final_candidates = heapq.nlargest(self.top_n, candidates, key=lambda x: x.score)
 
             self.logger.info(f"✅ 最终候选品种数量: {len(final_candidates)}")
             self.logger.info("=" * 80)
@@ -173,13 +363,28 @@ class MarketScanner:
             traceback.print_exc()
             return []
 
+    def _check_client_session(self):
+        """确认客户端复用长连接会话（仅检查一次），否则 K 线突发请求会被 TLS 握手拖慢"""
+        if self._session_checked:
+            return
+        self._session_checked = True
+        session = getattr(self.client, "session", None)
+        if session is None or session.closed:
+            self.logger.warning("⚠️ 客户端未复用长连接会话，K 线批量拉取将逐次建连")
+
     async def _fetch_instruments(self) -> List[str]:
         """
-        获取所有 USDT 永续合约
+        获取所有 USDT 永续合约（TTL 缓存）
 
         Returns:
             List[str]: 交易对列表，如 ["BTC-USDT-SWAP", "ETH-USDT-SWAP"]
         """
+        return await self._cache.get_or_load(
+            ("instruments", "SWAP"), self.ttl_instruments, self._load_instruments
+        )
+
+    async def _load_instruments(self) -> List[str]:
+        """从交易所拉取 USDT 永续合约列表"""
         try:
             # 获取所有交易品种
             result = await self.client._request("GET", "/api/v5/public/instruments", params={"instType": "SWAP"})
@@ -207,7 +412,7 @@ class MarketScanner:
 
     async def _fetch_tickers(self, instruments: List[str]) -> List[Dict]:
         """
-        获取所有品种的 Ticker 数据（使用 market_data_fetcher）
+        获取所有品种的 Ticker 数据（使用 market_data_fetcher，TTL 缓存）
 
         Args:
             instruments: 交易对列表
@@ -215,6 +420,14 @@ class MarketScanner:
         Returns:
             List[Dict]: Ticker 数据列表
         """
+        return await self._cache.get_or_load(
+            ("tickers", tuple(instruments)),
+            self.ttl_tickers,
+            lambda: self._load_tickers(instruments),
+        )
+
+    async def _load_tickers(self, instruments: List[str]) -> List[Dict]:
+        """通过 market_data_fetcher 拉取 Ticker"""
         try:
             # 使用 market_data_fetcher 获取 ticker
             tickers = await self.market_data_fetcher.get_tickers_by_symbols(instruments)
@@ -228,7 +441,7 @@ class MarketScanner:
 
     def _filter_tickers(self, tickers: List[Dict]) -> List[Dict]:
         """
-        初筛 Ticker
+        初筛 Ticker（NumPy 向量化）
 
         筛选条件：
         - 24h 成交额 >= min_volume_24h
@@ -238,201 +451,325 @@ class MarketScanner:
             tickers: Ticker 数据列表
 
         Returns:
-            List[Dict]: 筛选后的 Ticker 列表
+            List[Dict]: 筛选后的 Ticker 列表（按成交额降序）
         """
-        filtered = []
-        reject_stats = {
-            "low_volume": 0,
-            "low_volatility": 0,
-            "high_volatility": 0,
-            "error": 0
-        }
-
-        for ticker in tickers:
-            try:
-                symbol = ticker.get("instId", "")
-                # vol_ccy = float(ticker.get("volCcy", 0))  # 24h 成交量
-                last_price = float(ticker.get("last", 0))  # 最新价
-                open_24h = float(ticker.get("open24h", 0))  # 24h 开盘价
-                # self.logger.info(
-                #     f"Symbol: {symbol} | Raw VolCcy: {ticker.get('volCcy')} | Raw VolCcy24h: {ticker.get('volCcy24h')} | Last: {ticker.get('last')}")
-                # 计算 24h 成交额（USDT）
-                volume_24h = float(ticker.get("volCcy24h", 0))*last_price
-                # print("marketscanner debug:24小时成交额")
-                # print(volume_24h)
-                # 计算涨跌幅
-                price_change_24h = 0.0
-                if open_24h > 0:
-                    price_change_24h = ((last_price - open_24h) / open_24h) * 100
-                    # 汇报每一个币种的筛选过程 (满足你的汇报需求)
-                self.logger.info(
-                    f"🔍 [初筛] {symbol:20s} | 成交额: {volume_24h:15,.0f} USDT | 涨跌幅: {price_change_24h:6.2f}%")
-
-                if volume_24h < self.min_volume_24h:
-                    self.logger.info(f"   ❌ 淘汰: 成交额低于门槛 ({self.min_volume_24h:,} USDT)")
-                    reject_stats["low_volume"] += 1
-                    continue
-
-                if abs(price_change_24h) < self.min_price_change:
-                    self.logger.info(f"   ❌ 淘汰: 涨跌幅波动不足 ({self.min_price_change}%)")
-                    reject_stats["low_volatility"] += 1
-                    continue
-
-                if abs(price_change_24h) > self.max_price_change:
-                    self.logger.info(f"   ❌ 淘汰: 涨跌幅过激, 风险过高 ({abs(price_change_24h):.2f}% > {self.max_price_change}%)")
-                    reject_stats["high_volatility"] += 1
-                    continue
+        if not tickers:
+            return []
 
-                # 筛选条件
-                if volume_24h >= self.min_volume_24h:
-                    if abs(price_change_24h) >= self.min_price_change:
-                        if abs(price_change_24h) <= self.max_price_change:
-                            # 添加额外信息
-                            ticker["_volume_24h"] = volume_24h
-                            ticker["_price_change_24h"] = price_change_24h
-                            ticker["_current_price"] = last_price
-                            ticker["_high_24h"] = float(ticker.get("high24h", 0))
-                            ticker["_low_24h"] = float(ticker.get("low24h", 0))
-
-                            filtered.append(ticker)
-
-            except Exception as e:
-                self.logger.error(f"❌ 筛选 {ticker.get('instId', 'Unknown')} 失败: {e}")
-                reject_stats["error"] += 1
-                continue
+        # 一次性把各字段解析为 float64 数组（无法解析的值为 NaN）
+        last_price = _column(tickers, "last")
+        open_24h = _column(tickers, "open24h")
+        vol_ccy_24h = _column(tickers, "volCcy24h")
+        high_24h = _column(tickers, "high24h")
+        low_24h = _column(tickers, "low24h")
+
+        error_mask = (
+            np.isnan(last_price) | np.isnan(open_24h) | np.isnan(vol_ccy_24h)
+            | np.isnan(high_24h) | np.isnan(low_24h)
+        )
+
+        # 计算 24h 成交额（USDT）和涨跌幅
+        with np.errstate(divide="ignore", invalid="ignore"):
+            volume_24h = vol_ccy_24h * last_price
+            price_change_24h = np.where(
+                open_24h > 0, (last_price - open_24h) / open_24h * 100, 0.0
+            )
+        abs_change = np.abs(price_change_24h)
+
+        # 按原有顺序逐级淘汰：成交额 -> 波动不足 -> 波动过激
+        valid = ~error_mask
+        low_volume = valid & (volume_24h < self.min_volume_24h)
+        remaining = valid & ~low_volume
+        low_volatility = remaining & (abs_change < self.min_price_change)
+        remaining &= ~low_volatility
+        high_volatility = remaining & (abs_change > self.max_price_change)
+        passed = remaining & ~high_volatility
+
+        # 按 24h 成交额降序（稳定排序）
+        passed_idx = np.flatnonzero(passed)
+        order = passed_idx[np.argsort(-volume_24h[passed_idx], kind="stable")]
+
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self._log_filter_details(
+                tickers, volume_24h, price_change_24h,
+                error_mask, low_volume, low_volatility, high_volatility,
+            )
+
+        # 只把通过的行写回 dict
+        volume_list = volume_24h.tolist()
+        change_list = price_change_24h.tolist()
+        last_list = last_price.tolist()
+        high_list = high_24h.tolist()
+        low_list = low_24h.tolist()
+        order_list = order.tolist()
+        filtered = [tickers[i] for i in order_list]  # 长度已知，一次建好不逐个 append
+        for ticker, i in zip(filtered, order_list):
+            ticker["_volume_24h"] = volume_list[i]
+            ticker["_price_change_24h"] = change_list[i]
+            ticker["_current_price"] = last_list[i]
+            ticker["_high_24h"] = high_list[i]
+            ticker["_low_24h"] = low_list[i]
 
-        # 按 24h 成交额排序
-        filtered.sort(key=lambda x: x.get("_volume_24h", 0), reverse=True)
+        reject_stats = {
+            "low_volume": int(low_volume.sum()),
+            "low_volatility": int(low_volatility.sum()),
+            "high_volatility": int(high_volatility.sum()),
+            "error": int(error_mask.sum()),
+        }
 
         # 输出淘汰统计
-        self.logger.info(f"📊 初筛统计:")
-        self.logger.info(f"   - 总数量: {len(tickers)}")
-        self.logger.info(f"   - 通过: {len(filtered)}")
-        self.logger.info(f"   - 淘汰: {len(tickers) - len(filtered)}")
-        if reject_stats["low_volume"] > 0:
-            self.logger.info(f"     * 成交额过低: {reject_stats['low_volume']}")
-        if reject_stats["low_volatility"] > 0:
-            self.logger.info(f"     * 涨跌幅过低: {reject_stats['low_volatility']}")
-        if reject_stats["high_volatility"] > 0:
-            self.logger.info(f"     * 涨跌幅过高: {reject_stats['high_volatility']}")
-        if reject_stats["error"] > 0:
-            self.logger.info(f"     * 错误: {reject_stats['error']}")
+        self._log_stats("📊 初筛统计:", "总数量", len(tickers), len(filtered), reject_stats, _FILTER_REJECT_LABELS)
 
         return filtered
 
+    def _log_filter_details(
+        self,
+        tickers: List[Dict],
+        volume_24h: np.ndarray,
+        price_change_24h: np.ndarray,
+        error_mask: np.ndarray,
+        low_volume: np.ndarray,
+        low_volatility: np.ndarray,
+        high_volatility: np.ndarray,
+    ):
+        """逐个品种输出初筛过程（仅 DEBUG 级别）"""
+        for i, ticker in enumerate(tickers):
+            symbol = ticker.get("instId", "")
+            if error_mask[i]:
+                self.logger.debug(f"❌ 筛选 {symbol or 'Unknown'} 失败: 无效数值")
+                continue
+            self.logger.debug(
+                f"🔍 [初筛] {symbol:20s} | 成交额: {volume_24h[i]:15,.0f} USDT | 涨跌幅: {price_change_24h[i]:6.2f}%")
+            if low_volume[i]:
+                self.logger.debug(f"   ❌ 淘汰: 成交额低于门槛 ({self.min_volume_24h:,} USDT)")
+            elif low_volatility[i]:
+                self.logger.debug(f"   ❌ 淘汰: 涨跌幅波动不足 ({self.min_price_change}%)")
+            elif high_volatility[i]:
+                self.logger.debug(f"   ❌ 淘汰: 涨跌幅过激, 风险过高 ({abs(price_change_24h[i]):.2f}% > {self.max_price_change}%)")
+
     async def _analyze_candidates(self, tickers: List[Dict]) -> List[ScanResult]:
         """
-        并发对候选品种进行技术分析
+        并发对候选品种进行技术分析（K 线拉取与环境分析流水线化）
         """
         candidates = []
+        passed = []  # [(ticker, regime_analysis), ...]
         reject_stats = {
             "no_klines": 0,
             "no_regime": 0,
             "not_trend": 0,
             "low_adx": 0,
             "low_atr": 0,
-            "error": 0
+            "timeout": 0,
+            "error": 0,
+            "skipped": 0
         }
+        best: List[float] = []  # 已通过品种中评分最高的 top_n 个（小顶堆）
+
+        # 🟢 流水线：N 个拉取协程 → 有界队列 → M 个分析消费者
+        # 网络等待与指标计算重叠，网络并发与 CPU 并发互不绑定
+        fetch_q: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        pending = iter(tickers)  # 拉取协程共享的输入迭代器
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        stream = self._kline_stream
+        # 逐个品种的过程日志只在 DEBUG 级别输出，汇总统计保留在 INFO
+        log = self.logger
+        debug = log.isEnabledFor(logging.DEBUG)
+
+        async def fetcher():
+            """生产者：拉取 4H K 线并放入队列"""
+            for ticker in pending:
+                # 输入按成交额降序：当前品种的评分上界即剩余全部品种的上界
+                if (
+                    self.early_exit
+                    and len(best) >= self.top_n
+                    and best[0] >= self._score_upper_bound(ticker)
+                ):
+                    # 耗尽共享迭代器，其余拉取协程随之结束
+                    reject_stats["skipped"] += 1 + sum(1 for _ in pending)
+                    return
+
+                symbol = ticker.get("instId")
+                try:
+                    klines = self.kline_cache.get(symbol, "4H", self.kline_limit)
+                    if klines is None:
+                        # 缓存未命中：单个品种超时不拖累整批
+                        raw = await asyncio.wait_for(
+                            self.client.get_candlesticks(
+                                symbol, bar="4H", limit=self.kline_limit, as_array=True
+                            ),
+                            timeout=self.kline_timeout,
+                        )
+                        # 客户端已在解析阶段转为 float64 数组（其他客户端返回列表时在此转换）
+                        klines = klines_to_ndarray(raw) if raw is not None and len(raw) else None
+                        if klines is not None and stream is not None and stream.is_live(symbol):
+                            self.kline_cache.seed(symbol, "4H", klines)
+                except asyncio.TimeoutError:
+                    if debug:
+                        log.debug(f"   ❌ [{symbol}] K线请求超时")
+                    reject_stats["timeout"] += 1
+                    continue
+                except Exception as e:
+                    self.logger.error(f"   ❌ [{symbol}] 分析失败: {e}")
+                    reject_stats["error"] += 1
+                    continue
 
-        # 🟢 创建信号量，限制最大并发数为 20
-        # OKX 公共接口限频通常较宽松，但为了安全起见限制并发
-        sem = asyncio.Semaphore(5)
+                if klines is None or len(klines) < 50:
+                    if debug:
+                        log.debug(f"   ❌ [{symbol}] K线数据不足")
+                    reject_stats["no_klines"] += 1
+                    continue
 
-        async def process_ticker(ticker):
-            """单个品种的处理逻辑封装"""
-            async with sem:  # 获取令牌
+                await fetch_q.put((ticker, klines))
+
+        async def analyzer():
+            """消费者：市场环境分析 + 趋势筛选，收到哨兵后退出"""
+            while True:
+                item = await fetch_q.get()
+                if item is None:
+                    return
+                ticker, klines = item
+                symbol = ticker.get("instId")
+                # K 线最新在前（OKX）或在后均可：取两端较大的时间戳
+                cache_key = (symbol, int(max(klines[0][0], klines[-1][0])))
                 try:
-                    symbol = ticker.get("instId")
-
-                    # 获取 4H K 线
-                    klines = await self.client.get_candlesticks(symbol, bar="4H", limit=100)
-
-                    if not klines or len(klines) < 50:
-                        self.logger.info(f"   ❌ [{symbol}] K线数据不足")
-                        reject_stats["no_klines"] += 1
-                        return None
-
-                    # 市场环境分析
-                    regime_analysis = self.regime_detector.analyze(symbol, klines)
-                    if not regime_analysis:
-                        self.logger.info(f"   ❌ [{symbol}] 市场环境分析失败")
-                        reject_stats["no_regime"] += 1
-                        return None
-
-                    # 趋势筛选：如果配置了trend_only，只保留TREND环境的合约
-                    if self.trend_only:
-                        if regime_analysis.regime != "TREND":
-                            self.logger.info(f"   ❌ [{symbol}] 市场环境为 {regime_analysis.regime}，跳过")
-                            reject_stats["not_trend"] += 1
-                            return None
-                        # 检查ADX是否达标
-                        if regime_analysis.adx < self.min_adx:
-                            self.logger.info(f"   ❌ [{symbol}] ADX={regime_analysis.adx:.1f} < {self.min_adx}，趋势强度不足")
-                            reject_stats["low_adx"] += 1
-                            return None
-                        # 检查ATR扩张是否达标
-                        if regime_analysis.atr_expansion < self.min_atr_expansion:
-                            self.logger.info(f"   ❌ [{symbol}] ATR扩张={regime_analysis.atr_expansion:.2f} < {self.min_atr_expansion}，波动率不足")
-                            reject_stats["low_atr"] += 1
-                            return None
-
-                    # 计算分数
-                    score = self._calculate_score(ticker, regime_analysis)
-
-                    self.logger.info(f"   ✅ [{symbol}] 通过筛选 - 评分: {score:.2f} | 环境: {regime_analysis.regime} | ADX: {regime_analysis.adx:.1f}")
-
-                    return ScanResult(
-                        symbol=symbol,
-                        volume_24h=ticker.get("_volume_24h", 0),
-                        price_change_24h=ticker.get("_price_change_24h", 0),
-                        current_price=ticker.get("_current_price", 0),
-                        high_24h=ticker.get("_high_24h", 0),
-                        low_24h=ticker.get("_low_24h", 0),
-                        score=score,
-                        regime=regime_analysis.regime,
-                        adx=regime_analysis.adx,
-                        atr=regime_analysis.atr,
-                        atr_expansion=regime_analysis.atr_expansion,
-                        volatility_ratio=regime_analysis.volatility_ratio,
-                    )
+                    regime_analysis = self._regime_cache.get(cache_key)
+                    if regime_analysis is None:
+                        if executor is None:
+                            regime_analysis = self.regime_detector.analyze(symbol, klines)
+                        else:
+                            regime_analysis = await loop.run_in_executor(
+                                executor, self.regime_detector.analyze, symbol, klines
+                            )
+                        if regime_analysis:
+                            self._regime_cache.put(cache_key, regime_analysis)
                 except Exception as e:
-                    self.logger.error(f"   ❌ [{ticker.get('instId')}] 分析失败: {e}")
+                    self.logger.error(f"   ❌ [{symbol}] 分析失败: {e}")
                     reject_stats["error"] += 1
-                    return None
-
-        # 🟢 创建所有任务
-        tasks = [process_ticker(t) for t in tickers]
+                    continue
 
-        # 🟢 并发执行并等待结果
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+                if not regime_analysis:
+                    if debug:
+                        log.debug(f"   ❌ [{symbol}] 市场环境分析失败")
+                    reject_stats["no_regime"] += 1
+                    continue
 
-        # 收集成功的结果
-        for res in results:
-            if isinstance(res, ScanResult):
-                candidates.append(res)
-            elif isinstance(res, Exception):
-                self.logger.error(f"❌ 任务异常: {res}")
-                reject_stats["error"] += 1
+                # 趋势筛选：如果配置了trend_only，只保留TREND环境的合约
+                if self.trend_only:
+                    if regime_analysis.regime != "TREND":
+                        if debug:
+                            log.debug(f"   ❌ [{symbol}] 市场环境为 {regime_analysis.regime}，跳过")
+                        reject_stats["not_trend"] += 1
+                        continue
+                    # 检查ADX是否达标
+                    if regime_analysis.adx < self.min_adx:
+                        if debug:
+                            log.debug(f"   ❌ [{symbol}] ADX={regime_analysis.adx:.1f} < {self.min_adx}，趋势强度不足")
+                        reject_stats["low_adx"] += 1
+                        continue
+                    # 检查ATR扩张是否达标
+                    if regime_analysis.atr_expansion < self.min_atr_expansion:
+                        if debug:
+                            log.debug(f"   ❌ [{symbol}] ATR扩张={regime_analysis.atr_expansion:.2f} < {self.min_atr_expansion}，波动率不足")
+                        reject_stats["low_atr"] += 1
+                        continue
+
+                # 最终评分在全部分析完成后批量计算
+                passed.append((ticker, regime_analysis))
+                if self.early_exit and self.top_n > 0:
+                    score = self._calculate_score(ticker, regime_analysis)
+                    if len(best) < self.top_n:
+                        heapq.heappush(best, score)
+                    elif score > best[0]:
+                        heapq.heapreplace(best, score)
+
+        n_fetchers = max(1, min(self.max_concurrency, len(tickers)))
+        n_analyzers = max(1, self.analysis_workers)
+        fetchers = [asyncio.create_task(fetcher()) for _ in range(n_fetchers)]
+        analyzers = [asyncio.create_task(analyzer()) for _ in range(n_analyzers)]
+        try:
+            await asyncio.gather(*fetchers)
+            for _ in analyzers:
+                await fetch_q.put(None)
+            await asyncio.gather(*analyzers)
+        finally:
+            for task in fetchers + analyzers:
+                task.cancel()
+
+        # 🟢 一次内核调用为全部通过的品种打分
+        if passed:
+            scores = self._score_batch(passed)
+            append = candidates.append
+            for (ticker, regime_analysis), score in zip(passed, scores.tolist()):
+                symbol = ticker["instId"]
+                if debug:
+                    log.debug(f"   ✅ [{symbol}] 通过筛选 - 评分: {score:.2f} | 环境: {regime_analysis.regime} | ADX: {regime_analysis.adx:.1f}")
+                append(ScanResult(
+                    symbol=symbol,
+                    volume_24h=ticker["_volume_24h"],
+                    price_change_24h=ticker["_price_change_24h"],
+                    current_price=ticker["_current_price"],
+                    high_24h=ticker["_high_24h"],
+                    low_24h=ticker["_low_24h"],
+                    score=score,
+                    regime=regime_analysis.regime,
+                    adx=regime_analysis.adx,
+                    atr=regime_analysis.atr,
+                    atr_expansion=regime_analysis.atr_expansion,
+                    volatility_ratio=regime_analysis.volatility_ratio,
+                ))
 
         # 输出趋势筛选统计
-        self.logger.info(f"📊 趋势筛选统计:")
-        self.logger.info(f"   - 分析数量: {len(tickers)}")
-        self.logger.info(f"   - 通过: {len(candidates)}")
-        self.logger.info(f"   - 淘汰: {len(tickers) - len(candidates)}")
-        if reject_stats["no_klines"] > 0:
-            self.logger.info(f"     * K线数据不足: {reject_stats['no_klines']}")
-        if reject_stats["no_regime"] > 0:
-            self.logger.info(f"     * 市场环境分析失败: {reject_stats['no_regime']}")
-        if reject_stats["not_trend"] > 0:
-            self.logger.info(f"     * 非趋势环境: {reject_stats['not_trend']}")
-        if reject_stats["low_adx"] > 0:
-            self.logger.info(f"     * ADX过低: {reject_stats['low_adx']}")
-        if reject_stats["low_atr"] > 0:
-            self.logger.info(f"     * ATR扩张过低: {reject_stats['low_atr']}")
-        if reject_stats["error"] > 0:
-            self.logger.info(f"     * 分析错误: {reject_stats['error']}")
+        self._log_stats("📊 趋势筛选统计:", "分析数量", len(tickers), len(candidates), reject_stats, _ANALYZE_REJECT_LABELS)
 
         return candidates
+
+    def _log_stats(self, title: str, total_label: str, total: int, passed: int, reject_stats: Dict, labels):
+        """统计块拼成一条记录输出（只列出非零的淘汰原因）"""
+        lines = [
+            title,
+            f"   - {total_label}: {total}",
+            f"   - 通过: {passed}",
+            f"   - 淘汰: {total - passed}",
+        ]
+        lines.extend(
+            f"     * {label}: {reject_stats[key]}" for key, label in labels if reject_stats[key] > 0
+        )
+        self.logger.info("\n".join(lines))
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        """懒加载环境分析进程池（跨扫描复用）"""
+        if self.analysis_workers <= 0:
+            return None
+        if self._executor is None:
+            # spawn 启动子进程：不继承事件循环、aiohttp 连接与 numba 线程池（fork 后可能死锁）
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.analysis_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def _update_kline_stream(self, tickers: List[Dict]):
+        """按成交额排名更新 K 线 WebSocket 订阅"""
+        symbols = [t.get("instId") for t in tickers[:self.ws_kline_symbols]]
+        if self._kline_stream is None:
+            self._kline_stream = KlineStream(
+                self.kline_cache,
+                bar="4H",
+                url=self.ws_url,
+                proxy=getattr(self.client, "proxy", None),
+            )
+        await self._kline_stream.set_symbols(symbols)
+
+    def close(self):
+        """释放环境分析进程池与 K 线订阅"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._kline_stream is not None:
+            self._kline_stream.close()
+            self._kline_stream = None
+
     def _calculate_score(self, ticker: Dict, regime_analysis: RegimeAnalysis) -> float:
         """
         计算综合评分
@@ -450,61 +787,60 @@ class MarketScanner:
         Returns:
             float: 综合评分（0-100）
         """
-        score = 0.0
-
-        # 1. 成交额评分（归一化）
-        volume_24h = ticker.get("_volume_24h", 0)
-        volume_score = min(volume_24h / 100000000, 1.0)  # 1 亿 USDT 满分
-        score += volume_score * 30
-
-        # 2. 涨跌幅评分（适中最好）
-        price_change_24h = abs(ticker.get("_price_change_24h", 0))
-        # 理想涨跌幅：3% - 10%
-        if 3 <= price_change_24h <= 10:
-            change_score = 1.0
-        elif price_change_24h < 3:
-            change_score = price_change_24h / 3
-        else:
-            change_score = max(0, 1 - (price_change_24h - 10) / 10)
-        score += change_score * 20
-
-        # 3. 市场环境评分
-        regime = regime_analysis.regime
-        confidence = regime_analysis.confidence
-        if regime == "TREND":
-            regime_score = 0.9  # 趋势适合策略
-        elif regime == "RANGE":
-            regime_score = 0.7  # 震荡也适合
-        else:  # CHAOS
-            regime_score = 0.3  # 混乱不适合
-        score += regime_score * confidence * 30
-
-        # 4. 波动率评分（适中最好）
-        atr_expansion = regime_analysis.atr_expansion
-        # 理想 ATR 扩张：1.0 - 1.5
-        if 1.0 <= atr_expansion <= 1.5:
-            volatility_score = 1.0
-        elif atr_expansion < 1.0:
-            volatility_score = atr_expansion
-        else:
-            volatility_score = max(0, 1 - (atr_expansion - 1.5) / 1.5)
-        score += volatility_score * 20
-
-        return min(score, 100.0)
+        analysis = regime_analysis
+        return float(_score_kernel(
+            float(ticker["_volume_24h"]),
+            float(ticker["_price_change_24h"]),
+            _REGIME_CODES.get(analysis.regime, _REGIME_CHAOS),
+            float(analysis.confidence),
+            float(analysis.atr_expansion),
+        ))
+
+    @staticmethod
+    def _score_upper_bound(ticker: Dict) -> float:
+        """给定成交额下可能达到的最高评分（其余维度按满分计）"""
+        volume_score = min(ticker["_volume_24h"] / 100000000, 1.0)
+        return min(volume_score * 30 + _NON_VOLUME_MAX_SCORE, 100.0)
+
+    def _score_batch(self, passed: List) -> np.ndarray:
+        """
+        批量计算综合评分
+
+        Args:
+            passed: [(ticker, regime_analysis), ...]
+
+        Returns:
+            np.ndarray: 与 passed 一一对应的评分
+        """
+        # 初筛已写入 _volume_24h / _price_change_24h，直接下标访问；方法查找提到循环外
+        n = len(passed)
+        tickers = [t for t, _ in passed]
+        analyses = [a for _, a in passed]
+        code_of = _REGIME_CODES.get
+        volume_24h = np.fromiter((t["_volume_24h"] for t in tickers), np.float64, n)
+        price_change_24h = np.fromiter((t["_price_change_24h"] for t in tickers), np.float64, n)
+        regime_code = np.fromiter((code_of(a.regime, _REGIME_CHAOS) for a in analyses), np.int8, n)
+        confidence = np.fromiter((a.confidence for a in analyses), np.float64, n)
+        atr_expansion = np.fromiter((a.atr_expansion for a in analyses), np.float64, n)
+        return _score_kernel_batch(volume_24h, price_change_24h, regime_code, confidence, atr_expansion)
 
 
 # 便捷函数
-async def scan_market(client, config: Dict, regime_detector) -> List[ScanResult]:
+async def scan_market(client, market_data_fetcher, config: Dict, regime_detector) -> List[ScanResult]:
     """
-    便捷函数：执行市场扫描
+    便捷函数：执行一次市场扫描
 
     Args:
         client: OKX 客户端
+        market_data_fetcher: 行情获取器
         config: 配置字典
         regime_detector: 市场环境检测器
 
     Returns:
         List[ScanResult]: 扫描结果列表
     """
-    scanner = MarketScanner(client, config, regime_detector)
-    return await scanner.scan()
+    scanner = MarketScanner(client, market_data_fetcher, config, regime_detector)
+    try:
+        return await scanner.scan()
+    finally:
+        scanner.close()
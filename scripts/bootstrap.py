@@ -5,10 +5,17 @@
 
 import sys
 import os
-import importlib
+import importlib.util
 import yaml
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
+
+# 优先使用 libyaml C 解析器
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
 
 # 加载 .env 文件
 try:
@@ -18,7 +25,8 @@ except ImportError:
     pass
 
 # 添加项目根目录到路径
-sys.path.insert(0, str(Path(__file__).parent.parent))
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
 
 
 class BootstrapChecker:
@@ -28,7 +36,8 @@ class BootstrapChecker:
         self.errors: List[str] = []
         self.warnings: List[str] = []
         # 如果传入了 root 就用传入的，否则自动推导
-        self.project_root = project_root if project_root else Path(__file__).parent.parent
+        self.project_root = project_root if project_root else ROOT_DIR
+        self.config_dir = self.project_root / "config"
 
     def check_python_version(self) -> bool:
         """检查 Python 版本"""
@@ -49,10 +58,23 @@ class BootstrapChecker:
             "exchange", "monitor", "scripts", "data/logs", "data/history"
         ]
 
+        # 每个父目录只 scandir 一次，代替逐个 exists() 的 stat 调用
+        listed: Dict[Path, Set[str]] = {}
+
+        def _exists(rel_path: str) -> bool:
+            parent = self.project_root
+            for part in rel_path.split("/"):
+                if parent not in listed:
+                    listed[parent] = self._list_entries(parent)
+                if part not in listed[parent]:
+                    return False
+                parent = parent / part
+            return True
+
         all_ok = True
         for dir_name in required_dirs:
             dir_path = self.project_root / dir_name
-            if not dir_path.exists():
+            if not _exists(dir_name):
                 try:
                     dir_path.mkdir(parents=True, exist_ok=True)
                     print(f"  ✨ {dir_name}/ - 不存在 (已自动创建)")
@@ -66,31 +88,53 @@ class BootstrapChecker:
             print(f"  ✅ 目录结构完整")
         return all_ok
 
+    @staticmethod
+    def _list_entries(dir_path: Path) -> Set[str]:
+        """列出目录下的条目名（目录不存在时返回空集合）"""
+        try:
+            with os.scandir(dir_path) as it:
+                return {entry.name for entry in it}
+        except OSError:
+            return set()
+
     def check_config_files(self) -> bool:
         """检查配置文件"""
         print("  Checking config files...")
-        config_dir = self.project_root / "config"
         # 根据 main.py 的要求，主要检查这三个
         required_files = ["account.yaml", "strategy.yaml", "risk.yaml"]
 
+        # 一次列目录确定缺失文件；存在的文件并发读取 + 解析，结果按原顺序汇总输出
+        present = self._list_entries(self.config_dir)
+        to_parse = [name for name in required_files if name in present]
+        parsed: Dict[str, Optional[Exception]] = {}
+        if to_parse:
+            with ThreadPoolExecutor(max_workers=min(8, len(to_parse))) as ex:
+                parsed = dict(zip(to_parse, ex.map(lambda name: self._load_yaml(self.config_dir / name), to_parse)))
+
         all_ok = True
         for file_name in required_files:
-            file_path = config_dir / file_name
-            if not file_path.exists():
+            if file_name not in parsed:
                 self.errors.append(f"配置文件不存在: {file_name}")
                 print(f"  ❌ {file_name} - 不存在")
                 all_ok = False
+            elif parsed[file_name] is not None:
+                self.errors.append(f"配置文件格式错误: {file_name} ({parsed[file_name]})")
+                print(f"  ❌ {file_name} - YAML 格式错误")
+                all_ok = False
             else:
-                try:
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        yaml.safe_load(f)
-                    print(f"  ✅ {file_name} - 格式正常")
-                except Exception as e:
-                    self.errors.append(f"配置文件格式错误: {file_name} ({e})")
-                    print(f"  ❌ {file_name} - YAML 格式错误")
-                    all_ok = False
+                print(f"  ✅ {file_name} - 格式正常")
         return all_ok
 
+    @staticmethod
+    def _load_yaml(file_path: Path) -> Optional[Exception]:
+        """读取并解析单个 YAML 文件，返回异常或 None"""
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                yaml.load(f, Loader=SafeLoader)
+        except Exception as e:
+            return e
+        return None
+
     def check_dependencies(self) -> bool:
         """检查依赖包"""
         print("  Checking dependencies...")
@@ -104,11 +148,13 @@ class BootstrapChecker:
             "numpy": "numpy"
         }
 
+        # 只解析模块 spec（查找文件路径），线程并发可重叠磁盘 I/O
+        with ThreadPoolExecutor(max_workers=min(8, len(required_packages))) as ex:
+            results = list(ex.map(self._try_import, required_packages.items()))
+
         all_ok = True
-        for pkg_name, import_name in required_packages.items():
-            try:
-                importlib.import_module(import_name)
-            except ImportError:
+        for pkg_name, _, exc in results:
+            if exc is not None:
                 self.errors.append(f"依赖包未安装: {pkg_name}")
                 print(f"  ❌ {pkg_name} - 未安装")
                 all_ok = False
@@ -117,6 +163,21 @@ class BootstrapChecker:
             print("  ✅ 核心依赖包已安装")
         return all_ok
 
+    @staticmethod
+    def _try_import(item: Tuple[str, str]) -> Tuple[str, str, Optional[ImportError]]:
+        """
+        探测单个包是否已安装，返回 (包名, import 名, 异常或 None)
+
+        find_spec 只定位模块、不执行其顶层代码，避免为自检加载 pandas / numpy
+        """
+        pkg_name, import_name = item
+        try:
+            if importlib.util.find_spec(import_name) is None:
+                raise ImportError(import_name)
+        except ImportError as e:
+            return pkg_name, import_name, e
+        return pkg_name, import_name, None
+
     def run(self) -> bool:
         """运行所有检查"""
         print("-" * 60)
@@ -5,26 +5,38 @@
 """
 
 import sys
+import time
 import asyncio
 import logging
+from operator import itemgetter
 from pathlib import Path
-import yaml
 import os
 from dotenv import load_dotenv
 
 # 添加项目根目录到路径
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from core.config_loader import load_yaml_file
 from exchange.okx_client import OKXClient
 
 # 配置简单的日志
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-async def close_position(client: OKXClient, symbol: str, direction: str):
-    """平掉单个仓位"""
+# 平仓请求并发上限与重试（OKX 交易接口按账户限频，突发请求会被拒）
+CLOSE_CONCURRENCY = 5
+CLOSE_RETRIES = 3
+BACKOFF_BASE = 0.5  # 秒
+BACKOFF_MAX = 4.0
+
+_close_sem = asyncio.Semaphore(CLOSE_CONCURRENCY)
+
+# 挂单字段提取（C 实现，一次取两列）
+_order_ids = itemgetter("instId", "ordId")
+
+async def close_position(client: OKXClient, inst_id: str, direction: str):
+    """平掉单个仓位（inst_id 直接使用持仓返回的 instId，如 BTC-USDT-SWAP）"""
     try:
-        inst_id = f"{symbol}-SWAP"
         # 构造平仓请求
         data = {
             "instId": inst_id,
@@ -35,20 +47,65 @@ async def close_position(client: OKXClient, symbol: str, direction: str):
 
         logger.info(f"正在平仓 {inst_id} ({direction})...")
 
-        # 直接调用 API，不走 OrderManager
-        result = await client._request("POST", "/api/v5/trade/close-position", data=data)
+        for attempt in range(CLOSE_RETRIES):
+            # 直接调用 API，不走 OrderManager
+            async with _close_sem:
+                result = await client._request("POST", "/api/v5/trade/close-position", data=data)
 
-        if result is not None:
-            logger.info(f"✅ {inst_id} 平仓请求已发送")
-            return True
-        else:
-            logger.error(f"❌ {inst_id} 平仓失败 (API返回空)")
-            return False
+            if result is not None:
+                logger.info(f"✅ {inst_id} 平仓请求已发送")
+                return True
+
+            # _request 出错时返回 None（限频 / 网络抖动），指数退避后重试
+            if attempt < CLOSE_RETRIES - 1:
+                delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt)
+                logger.warning(f"⚠️ {inst_id} 平仓失败，{delay:.1f}s 后重试 ({attempt + 1}/{CLOSE_RETRIES})")
+                await asyncio.sleep(delay)
+
+        logger.error(f"❌ {inst_id} 平仓失败 (API返回空)")
+        return False
 
     except Exception as e:
-        logger.error(f"❌ {symbol} 平仓异常: {e}")
+        logger.error(f"❌ {inst_id} 平仓异常: {e}")
         return False
 
+async def close_positions_batch(client: OKXClient, positions: list) -> list:
+    """
+    批量市价减仓平掉持仓（batch-orders 每 20 个一次请求）
+    :return: 未确认成功的持仓，由 close_position 逐个兜底
+    """
+    tag = int(time.time())
+    orders = []
+    for i, pos in enumerate(positions):
+        size = pos.get("pos", "0")
+        pos_side = pos.get("posSide", "net")
+        if pos_side == "net":
+            side = "sell" if float(size) > 0 else "buy"
+        else:
+            side = "sell" if pos_side == "long" else "buy"
+
+        order = {
+            "instId": pos.get("instId"),
+            "tdMode": pos.get("mgnMode") or "cross",
+            "side": side,
+            "ordType": "market",
+            "sz": size.lstrip("-"),
+            "reduceOnly": True,
+            "clOrdId": f"closeall{tag}n{i}",
+        }
+        if pos_side != "net":
+            order["posSide"] = pos_side
+        orders.append(order)
+
+    results = await client.place_batch_orders(orders)
+    done = {res.get("clOrdId") for res in results if res.get("sCode") == "0"}
+    for res in results:
+        if res.get("sCode") != "0":
+            logger.error(f"❌ 批量平仓失败: {res.get('clOrdId')} ({res.get('sMsg')})")
+
+    logger.info(f"✅ 批量平仓已提交 {len(done)}/{len(orders)} 个")
+    return [pos for pos, order in zip(positions, orders) if order["clOrdId"] not in done]
+
 async def cancel_all_orders(client: OKXClient):
     """撤销所有挂单"""
     logger.info("正在撤销所有挂单...")
@@ -59,15 +116,19 @@ async def cancel_all_orders(client: OKXClient):
             logger.info("✅ 当前无挂单")
             return
 
-        for order in pending:
-            inst_id = order.get("instId")
-            ord_id = order.get("ordId")
-            logger.info(f"撤销订单: {inst_id} (ID: {ord_id})")
+        orders = [{"instId": inst_id, "ordId": ord_id} for inst_id, ord_id in map(_order_ids, pending)]
+        for order in orders:
+            logger.info(f"撤销订单: {order['instId']} (ID: {order['ordId']})")
 
-            await client._request("POST", "/api/v5/trade/cancel-order", data={
-                "instId": inst_id,
-                "ordId": ord_id
-            })
+        # 批量撤单：每 20 个一次请求，代替逐个 cancel-order
+        results = await client.cancel_batch_orders(orders)
+        cancelled = 0
+        for res in results:
+            if res.get("sCode") == "0":
+                cancelled += 1
+            else:
+                logger.error(f"❌ 撤单失败: {res.get('ordId')} ({res.get('sMsg')})")
+        logger.info(f"✅ 已撤销 {cancelled}/{len(orders)} 个挂单")
 
     except Exception as e:
         logger.error(f"❌ 撤单异常: {e}")
@@ -89,8 +150,7 @@ async def main():
         config_path = Path(__file__).parent.parent / "config" / "account.yaml"
 
         # 简单读取 yaml 用于获取子账户名（其实 api key 主要靠 env）
-        with open(config_path, "r", encoding="utf-8") as f:
-            account_config = yaml.safe_load(f)
+        account_config = load_yaml_file(config_path)
 
         print("✅ 配置加载成功")
     except Exception as e:
@@ -103,7 +163,8 @@ async def main():
         print("❌ 无法连接交易所，请检查网络或代理")
         return
 
-    try:
+    # 同一会话（连接池）服务撤单与全部并发平仓请求，退出时自动断开
+    async with client:
         # 4. 撤销所有挂单
         await cancel_all_orders(client)
 
@@ -121,22 +182,19 @@ async def main():
 
         print(f"发现 {len(active_positions)} 个持仓，准备平仓...")
 
-        # 6. 执行平仓
-        tasks = []
-        for pos in active_positions:
-            inst_id = pos.get("instId")
-            symbol = inst_id.replace("-SWAP", "")
-            pos_side = pos.get("posSide", "net")
+        # 6. 执行平仓：先批量减仓，未成功的再逐个 close-position 兜底
+        remaining = await close_positions_batch(client, active_positions)
 
-            tasks.append(close_position(client, symbol, pos_side))
+        tasks = [
+            close_position(client, pos.get("instId"), pos.get("posSide", "net"))
+            for pos in remaining
+        ]
 
         if tasks:
             await asyncio.gather(*tasks)
 
         print("\n✅ 所有操作执行完毕。请务必登录 OKX APP 确认最终状态！")
 
-    finally:
-        await client.disconnect()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
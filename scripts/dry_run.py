@@ -5,31 +5,51 @@
 
 import sys
 import asyncio
+import random
 from pathlib import Path
 from datetime import datetime
 
 # 添加项目根目录到路径
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from core.config_loader import load_yaml_file
 from core.context import Context
 from core.state_machine import StateMachine
 from core.scheduler import Scheduler
 from core.events import EventBus
 from strategy.cash_and_carry import CashAndCarryStrategy
-import yaml
 
 
 class MockMarketData:
     """模拟市场数据"""
 
-    @staticmethod
-    def get_market_data(symbol: str):
-        """获取模拟市场数据"""
-        from core.context import MarketData
+    # 每个品种复用同一个 MarketData 实例，每轮只原地刷新字段
+    _instances = {}
+
+    # 每轮价格随机游走的步长（标准差，相对价格）
+    PRICE_STEP = 0.0005
+    # 基差随机游走的步长（标准差，绝对比例）
+    BASIS_STEP = 0.0002
 
+    @classmethod
+    def get_market_data(cls, symbol: str):
+        """获取模拟市场数据（现货价格与基差随机游走，每轮行情都会变化）"""
         base_price = 50000 if "BTC" in symbol else 3000
 
-        return MarketData(
+        market_data = cls._instances.get(symbol)
+        if market_data is not None:
+            spot_price = market_data.spot_price * (1 + random.gauss(0, cls.PRICE_STEP))
+            basis = market_data.futures_price / market_data.spot_price - 1 + random.gauss(0, cls.BASIS_STEP)
+            market_data.spot_price = spot_price
+            market_data.futures_price = spot_price * (1 + basis)
+            market_data.depth.bid_1_price = spot_price * 0.9999
+            market_data.depth.ask_1_price = spot_price * 1.0001
+            market_data.next_funding_time = datetime.now()
+            return market_data
+
+        from core.context import MarketData
+
+        market_data = cls._instances[symbol] = MarketData(
             symbol=symbol,
             spot_price=base_price,
             futures_price=base_price * 1.001,
@@ -43,6 +63,7 @@ class MockMarketData:
                 "ask_1_amount": 10.0,
             },
         )
+        return market_data
 
 
 async def main():
@@ -56,14 +77,12 @@ async def main():
 
     config_dir = Path(__file__).parent.parent / "config"
 
-    with open(config_dir / "account.yaml", "r", encoding="utf-8") as f:
-        account_config = yaml.safe_load(f)
-
-    with open(config_dir / "strategy.yaml", "r", encoding="utf-8") as f:
-        strategy_config = yaml.safe_load(f)
+    account_config = load_yaml_file(config_dir / "account.yaml")
+    strategy_config = load_yaml_file(config_dir / "strategy.yaml")
+    instruments_config = load_yaml_file(config_dir / "instruments.yaml")
 
-    with open(config_dir / "instruments.yaml", "r", encoding="utf-8") as f:
-        instruments_config = yaml.safe_load(f)
+    # 启用的品种只筛选一次，后续所有循环直接遍历
+    enabled_symbols = tuple(i["symbol"] for i in instruments_config["instruments"] if i["enabled"])
 
     # 创建上下文
     print("创建上下文...")
@@ -89,59 +108,54 @@ async def main():
     # 模拟市场数据
     print("\n📊 模拟市场数据...")
 
-    for instrument in instruments_config["instruments"]:
-        if instrument["enabled"]:
-            symbol = instrument["symbol"]
-            market_data = MockMarketData.get_market_data(symbol)
-            context.update_market_data(market_data)
-            print(f"  - {symbol}: spot=${market_data.spot_price:.2f}, funding={market_data.funding_rate:.4%}")
+    for symbol in enabled_symbols:
+        market_data = MockMarketData.get_market_data(symbol)
+        context.update_market_data(market_data)
+        print(f"  - {symbol}: spot=${market_data.spot_price:.2f}, funding={market_data.funding_rate:.4%}")
 
     # 运行策略分析
     print("\n🧠 运行策略分析...")
 
-    for instrument in instruments_config["instruments"]:
-        if instrument["enabled"]:
-            symbol = instrument["symbol"]
-
-            print(f"\n分析 {symbol}:")
-
-            signal = await strategy.analyze(symbol, context)
-
-            print(f"  信号: {signal.action}")
-            print(f"  数量: {signal.quantity}")
-            print(f"  信心度: {signal.confidence:.2%}")
-            print(f"  原因: {signal.reason}")
-
-            if signal.action == "open":
-                print(f"  💡 建议开仓: {signal.quantity} {symbol}")
-
-                # 模拟开仓
-                from core.context import Position
-                market_data = context.get_market_data(symbol)
-                context.update_position(
-                    Position(
-                        symbol=symbol,
-                        side="cash_and_carry",
-                        quantity=signal.quantity,
-                        entry_price=market_data.spot_price,
-                        current_price=market_data.spot_price,
-                        unrealized_pnl=0.0,
-                        margin_used=0.0,
-                        leverage=1.0,
-                    )
+    for symbol in enabled_symbols:
+        print(f"\n分析 {symbol}:")
+
+        signal = await strategy.analyze(symbol, context)
+
+        print(f"  信号: {signal.action}")
+        print(f"  数量: {signal.quantity}")
+        print(f"  信心度: {signal.confidence:.2%}")
+        print(f"  原因: {signal.reason}")
+
+        if signal.action == "open":
+            print(f"  💡 建议开仓: {signal.quantity} {symbol}")
+
+            # 模拟开仓
+            from core.context import Position
+            market_data = context.get_market_data(symbol)
+            context.update_position(
+                Position(
+                    symbol=symbol,
+                    side="cash_and_carry",
+                    quantity=signal.quantity,
+                    entry_price=market_data.spot_price,
+                    current_price=market_data.spot_price,
+                    unrealized_pnl=0.0,
+                    margin_used=0.0,
+                    leverage=1.0,
                 )
-                print(f"  ✅ 已模拟开仓")
+            )
+            print(f"  ✅ 已模拟开仓")
 
-            elif signal.action == "close":
-                print(f"  💡 建议平仓: {signal.quantity} {symbol}")
+        elif signal.action == "close":
+            print(f"  💡 建议平仓: {signal.quantity} {symbol}")
 
-                # 模拟平仓
-                if symbol in context.positions:
-                    del context.positions[symbol]
-                    print(f"  ✅ 已模拟平仓")
+            # 模拟平仓
+            if symbol in context.positions:
+                del context.positions[symbol]
+                print(f"  ✅ 已模拟平仓")
 
-            elif signal.action == "hold":
-                print(f"  ⏸️  保持现状")
+        elif signal.action == "hold":
+            print(f"  ⏸️  保持现状")
 
     # 显示当前状态
     print("\n📊 当前状态:")
@@ -158,34 +172,58 @@ async def main():
     duration = 30  # 模拟运行30秒
     print(f"\n⏱️  模拟运行 {duration} 秒...")
 
-    start_time = datetime.now()
-
-    while (datetime.now() - start_time).total_seconds() < duration:
-        await asyncio.sleep(5)
-
-        # 更新模拟市场数据
-        for instrument in instruments_config["instruments"]:
-            if instrument["enabled"]:
-                symbol = instrument["symbol"]
+    from monitor.health_check import HealthChecker
+    health_checker = HealthChecker({}, event_bus)
+
+    # 到时由事件循环置位，不再每轮比较时间
+    stop = asyncio.Event()
+    asyncio.get_running_loop().call_later(duration, stop.set)
+    # 行情更新队列：每轮推送价格有变化的品种，None 为结束哨兵
+    updates: asyncio.Queue = asyncio.Queue()
+
+    async def feed_market_data():
+        """模拟行情源：每 5 秒刷新一轮行情，只推送发生变化的品种"""
+        last_quotes = {}
+        while not stop.is_set():
+            try:
+                # 每 5 秒一轮；运行时间到则立即结束，不必等到下一轮
+                await asyncio.wait_for(stop.wait(), timeout=5)
+                break
+            except asyncio.TimeoutError:
+                pass
+
+            changed = []
+            for symbol in enabled_symbols:
                 market_data = MockMarketData.get_market_data(symbol)
                 context.update_market_data(market_data)
+                quote = (market_data.spot_price, market_data.futures_price, market_data.funding_rate)
+                if last_quotes.get(symbol) != quote:
+                    last_quotes[symbol] = quote
+                    changed.append(symbol)
+            await updates.put(changed)
+        await updates.put(None)
+
+    feeder = asyncio.create_task(feed_market_data())
+
+    while True:
+        changed = await updates.get()
+        if changed is None:
+            break
+
+        # 只重新分析行情有变化的品种
+        for symbol in changed:
+            signal = await strategy.analyze(symbol, context)
 
-        # 重新分析
-        for instrument in instruments_config["instruments"]:
-            if instrument["enabled"]:
-                symbol = instrument["symbol"]
-                signal = await strategy.analyze(symbol, context)
-
-                if signal.action != "hold":
-                    print(f"\n[{datetime.now().strftime('%H:%M:%S')}] {symbol}: {signal.action} - {signal.reason}")
+            if signal.action != "hold":
+                print(f"\n[{datetime.now().strftime('%H:%M:%S')}] {symbol}: {signal.action} - {signal.reason}")
 
         # 检查健康状态
-        from monitor.health_check import HealthChecker
-        health_checker = HealthChecker({}, event_bus)
         health_status = await health_checker.check_all(context)
 
         print(f"  健康状态: {'✅ 正常' if all(health_status.values()) else '❌ 异常'}")
 
+    await feeder
+
     print("\n" + "=" * 60)
     print("✅ 空跑完成")
     print("=" * 60)
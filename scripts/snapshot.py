@@ -1,3 +1,5 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -13,26 +15,44 @@ EXCLUDE_DIRS = {
 OUTPUT = ROOT / "snapshot_all_code.py"
 TREE = ROOT / "snapshot_tree.txt"
 
+def walk_py_files(directory):
+    """深度优先遍历，排除目录整棵子树直接剪枝，不再逐个 stat 其中文件"""
+    with os.scandir(directory) as it:
+        entries = list(it)
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            if entry.name not in EXCLUDE_DIRS:
+                yield from walk_py_files(entry.path)
+        elif entry.name.endswith(".py"):
+            yield Path(entry.path)
+
 def collect_py_files():
-    files = []
-    for p in ROOT.rglob("*.py"):
-        if any(part in EXCLUDE_DIRS for part in p.parts):
-            continue
-        files.append(p)
-    return sorted(files)
+    return sorted(walk_py_files(ROOT))
+
+def read_source(path):
+    """读取源文件原始字节（非法 UTF-8 字节丢弃，与 errors="ignore" 一致）"""
+    data = path.read_bytes()
+    try:
+        data.decode("utf-8")
+    except UnicodeDecodeError:
+        data = data.decode("utf-8", errors="ignore").encode("utf-8")
+    return data
 
 def write_code_snapshot(files):
-    with OUTPUT.open("w", encoding="utf-8") as out:
-        for f in files:
-            out.write(f"\n\n# {'=' * 80}\n")
-            out.write(f"# FILE: {f.relative_to(ROOT)}\n")
-            out.write(f"# {'=' * 80}\n\n")
-            out.write(f.read_text(encoding="utf-8", errors="ignore"))
+    # 并发预读文件内容，重叠磁盘读取延迟
+    with ThreadPoolExecutor(max_workers=16) as ex:
+        contents = list(ex.map(read_source, files))
+
+    rule = f"# {'=' * 80}\n".encode("utf-8")
+    with open(OUTPUT, "wb", buffering=1 << 20) as out:
+        for f, data in zip(files, contents):
+            out.write(b"\n\n" + rule)
+            out.write(f"# FILE: {f.relative_to(ROOT)}\n".encode("utf-8"))
+            out.write(rule + b"\n")
+            out.write(data)
 
 def write_tree(files):
-    with TREE.open("w", encoding="utf-8") as out:
-        for f in files:
-            out.write(str(f.relative_to(ROOT)) + "\n")
+    TREE.write_text("".join(f"{f.relative_to(ROOT)}\n" for f in files), encoding="utf-8")
 
 if __name__ == "__main__":
     py_files = collect_py_files()
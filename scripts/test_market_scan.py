@@ -8,6 +8,8 @@ import asyncio
 import sys
 from pathlib import Path
 
+import numpy as np
+
 # 添加项目根目录到路径
 ROOT_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(ROOT_DIR))
@@ -19,39 +21,30 @@ from monitor.dashboard import Dashboard
 
 def create_mock_klines(symbol="ETH-USDT-SWAP", num_klines=100):
     """创建模拟 K 线数据（OKX 格式，9 列）"""
-    import random
     import time
 
-    klines = []
-    base_price = 2500.0
-
-    for i in range(num_klines):
-        timestamp = int((time.time() - (num_klines - i) * 4 * 3600) * 1000)
-        open_price = base_price + random.uniform(-50, 50)
-        close_price = open_price + random.uniform(-20, 20)
-        high_price = max(open_price, close_price) + random.uniform(0, 10)
-        low_price = min(open_price, close_price) - random.uniform(0, 10)
-        volume = random.uniform(1000, 10000)
-        vol_ccy = volume * close_price  # 成交额
-        vol_ccy_quote = vol_ccy  # 成交额（计价货币）
-        confirm = "1"  # 成交确认
-
-        # OKX K 线格式: [ts, o, h, l, c, vol, volCcy, volCcyQuote, confirm]
-        klines.append([
-            timestamp,
-            str(open_price),
-            str(high_price),
-            str(low_price),
-            str(close_price),
-            str(volume),
-            str(vol_ccy),
-            str(vol_ccy_quote),
-            confirm
-        ])
-
-        base_price = close_price
-
-    return klines
+    rng = np.random.default_rng()
+    n = num_klines
+
+    # 随机游走：每根开盘 = 上一根收盘 + 跳空，收盘 = 开盘 + 波动
+    open_off = rng.uniform(-50, 50, n)
+    close_off = rng.uniform(-20, 20, n)
+    close_price = 2500.0 + np.cumsum(open_off + close_off)
+    open_price = close_price - close_off
+    high_price = np.maximum(open_price, close_price) + rng.uniform(0, 10, n)
+    low_price = np.minimum(open_price, close_price) - rng.uniform(0, 10, n)
+    volume = rng.uniform(1000, 10000, n)
+    vol_ccy = volume * close_price  # 成交额（计价货币同值）
+
+    timestamps = ((time.time() - np.arange(n, 0, -1) * 4 * 3600) * 1000).astype(np.int64)
+    # OKX K 线格式: [ts, o, h, l, c, vol, volCcy, volCcyQuote, confirm]
+    values = np.column_stack(
+        (open_price, high_price, low_price, close_price, volume, vol_ccy, vol_ccy)
+    ).astype(str)
+    return [
+        [ts, *row, "1"]
+        for ts, row in zip(timestamps.tolist(), values.tolist())
+    ]
 
 
 async def test_regime_detector():
@@ -1,27 +1,44 @@
-from .cash_and_carry import CashAndCarryStrategy
-from .futures_grid import FuturesGridStrategy
-from .trend_strategy import TrendRollStrategy
-from .multi_trend_strategy import MultiTrendStrategy
+import importlib
+
+# 策略名称 → (模块, 类名)；按需导入，未使用的策略及其依赖不会在启动时加载
+_STRATEGY_CLASSES = {
+    "futures_grid": ("futures_grid", "FuturesGridStrategy"),
+    "cash_and_carry": ("cash_and_carry", "CashAndCarryStrategy"),
+    "trend_strategy": ("trend_strategy", "TrendRollStrategy"),
+    "multi_trend": ("multi_trend_strategy", "MultiTrendStrategy"),
+}
+
+# 类名 → 模块（PEP 562 延迟导入）
+_LAZY = {class_name: module_name for module_name, class_name in _STRATEGY_CLASSES.values()}
+
+__all__ = [*_LAZY, "StrategyFactory"]
+
+
+def __getattr__(name):
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value  # 之后的访问不再经过 __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
 
 def StrategyFactory(strategy_name, config, context, state_machine, order_manager, **kwargs):
     """
-    策略工厂：根据名称返回对应的策略实例
+    策略工厂：根据名称返回对应的策略实例（只导入被选中的策略模块）
     """
-    if strategy_name == "futures_grid":
-        return FuturesGridStrategy(config, context, state_machine, order_manager, **kwargs)
+    if strategy_name not in _STRATEGY_CLASSES:
+        raise ValueError(f"未知策略名称: {strategy_name}")
+
+    strategy_cls = __getattr__(_STRATEGY_CLASSES[strategy_name][1])
 
-    elif strategy_name == "cash_and_carry":
+    if strategy_name == "cash_and_carry":
         # 注意：这里需要确保 CashAndCarry 也适配了 BaseStrategy 的参数
         # 如果还没改，暂时需要手动适配
-        return CashAndCarryStrategy(config, context, state_machine, order_manager, kwargs.get('margin_guard'))
-
-    elif strategy_name == "trend_strategy":
-        # 实例化趋势滚仓策略
-        return TrendRollStrategy(config, context, state_machine, order_manager, **kwargs)
-
-    elif strategy_name == "multi_trend":
-        # 实例化多币种趋势策略
-        return MultiTrendStrategy(config, context, state_machine, order_manager, **kwargs)
+        return strategy_cls(config, context, state_machine, order_manager, kwargs.get('margin_guard'))
 
-    else:
-        raise ValueError(f"未知策略名称: {strategy_name}")
\ No newline at end of file
+    return strategy_cls(config, context, state_machine, order_manager, **kwargs)
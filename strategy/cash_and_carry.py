@@ -7,7 +7,7 @@ import asyncio
 from core.context import Context
 from core.state_machine import StateMachine, SystemState
 from strategy.base_strategy import BaseStrategy
-from strategy.conditions import StrategyConditions
+from strategy.conditions import StrategyConditions, StrategyParams
 from execution.order_manager import OrderManager
 from risk.margin_guard import MarginGuard
 
@@ -23,11 +23,15 @@ class CashAndCarryStrategy(BaseStrategy):
         self.risk = margin_guard
         self.logger = logging.getLogger(__name__)
 
-        self.conditions = StrategyConditions(config)
+        self.params = StrategyParams.from_config(config)
+        self.conditions = StrategyConditions(self.params)
+        # 上一次开仓判断 ((现货, 合约, 费率), 结果)：行情未变时直接复用
+        self._last_open_check = (None, False)
 
         # ⚠️ 注意：测试阶段金额较小
         self.order_amount = 10.0
         self.symbol = "ETH-USDT"
+        self.swap_symbol = f"{self.symbol}-SWAP"
 
     async def initialize(self):
         """策略初始化"""
@@ -48,11 +52,15 @@ class CashAndCarryStrategy(BaseStrategy):
             return
 
         spot_price = market.spot_price
-        swap_price = market.futures_price
-        funding_rate = market.funding_rate
+        quote = (spot_price, market.futures_price, market.funding_rate)
 
-        # 3. 检查开仓信号
-        if self.conditions.should_open(spot_price, swap_price, funding_rate):
+        # 3. 检查开仓信号（行情与上一 tick 相同则复用判断结果）
+        last_quote, should_open = self._last_open_check
+        if quote != last_quote:
+            should_open = self.conditions.should_open(*quote)
+            self._last_open_check = (quote, should_open)
+
+        if should_open:
 
             # 4. 风控检查
             if self.context.is_emergency:
@@ -77,7 +85,7 @@ class CashAndCarryStrategy(BaseStrategy):
                 success = await self.om.execute_dual_leg(
                     spot_symbol=self.symbol,
                     spot_size=qty,
-                    swap_symbol=f"{self.symbol}-SWAP",
+                    swap_symbol=self.swap_symbol,
                     swap_size="1"
                 )
 
@@ -146,7 +154,7 @@ class CashAndCarryStrategy(BaseStrategy):
             success = await self.om.execute_dual_leg(
                 spot_symbol=self.symbol,
                 spot_size=qty,
-                swap_symbol=f"{self.symbol}-SWAP",
+                swap_symbol=self.swap_symbol,
                 swap_size=signal["size"]
             )
 
@@ -165,7 +173,7 @@ class CashAndCarryStrategy(BaseStrategy):
 
         except Exception as e:
             result["error"] = str(e)
-            self.logger.error(f"执行异常: {e}")
+            self.logger.error("执行异常: %s", e)
             return result
 
     async def shutdown(self):
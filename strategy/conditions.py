@@ -3,40 +3,89 @@
 纯逻辑层：计算价差、判断是否满足开仓/平仓标准
 """
 import logging
+from dataclasses import dataclass
+from typing import Union
+
+from core.jit import njit
+
+# 开仓价差阈值（硬编码 0.1%，与 should_open 一致）
+OPEN_SPREAD_RATIO = 0.001
+# 平仓价差阈值：价差回落到 0.05% 以内
+CLOSE_SPREAD_RATIO = 0.0005
+
+# 每个 tick 都会调用的纯数值判断，预先声明签名编译（调试时可设置 NUMBA_DISABLE_JIT=1）
+_EVAL_SIGNATURE = "boolean(float64, float64, float64, float64, float64)"
+
+
+@njit(_EVAL_SIGNATURE, cache=True)
+def _eval_open(spot, swap, fr, open_spread, min_fr):
+    """价差比例 > open_spread 且 费率 > min_fr"""
+    # 先判断费率：绝大多数 tick 在这里被拒绝，且无需做除法
+    # 写成 not (x > y)：NaN 与任何值比较都为 False，缺失的费率 / 价格一律拒绝开仓
+    if not (fr > min_fr) or not (spot > 0):
+        return False
+    return (swap - spot) / spot > open_spread
 
-class StrategyConditions:
-    def __init__(self, config: dict):
-        self.logger = logging.getLogger(__name__)
 
+@njit(_EVAL_SIGNATURE, cache=True)
+def _eval_close(spot, swap, fr, close_spread, min_fr):
+    """价差比例 <= close_spread 或 费率 <= min_fr"""
+    if spot <= 0:
+        return False
+    # 费率为 NaN 时同样视为“费率不再为正”，触发平仓
+    return not (fr > min_fr) or (swap - spot) / spot <= close_spread
+
+
+@dataclass(slots=True, frozen=True)
+class StrategyParams:
+    """资金费率套利参数（从配置解析一次，策略与条件判断共享）"""
+
+    open_spread: float
+    min_funding_rate: float
+    close_spread: float
+
+    @classmethod
+    def from_config(cls, config: dict) -> "StrategyParams":
         strat_cfg = config.get("strategy", {}).get("cash_and_carry", {})
         open_cond = strat_cfg.get("open_conditions", {})
         close_cond = strat_cfg.get("close_conditions", {})
 
-        # 核心阈值
-        self.open_spread = float(open_cond.get("spread_threshold", 0.0001)) # 这里其实应该叫 spread_threshold, 先复用你的字段
-        self.min_funding_rate = float(open_cond.get("min_funding_rate", 0.0001))
+        return cls(
+            open_spread=float(open_cond.get("spread_threshold", 0.0001)), # 这里其实应该叫 spread_threshold, 先复用你的字段
+            min_funding_rate=float(open_cond.get("min_funding_rate", 0.0001)),
+            close_spread=float(close_cond.get("spread_threshold", 0.0)),
+        )
 
-        self.close_spread = float(close_cond.get("spread_threshold", 0.0))
 
-    def should_open(self, spot_price: float, swap_price: float, funding_rate: float) -> bool:
+class StrategyConditions:
+    def __init__(self, params: Union[StrategyParams, dict]):
         """
-        判断是否开仓
-        逻辑：(合约 - 现货) / 现货 > 阈值 且 费率 > 最低要求
+        Args:
+            params: 已解析的 StrategyParams，或原始配置字典（就地解析）
         """
-        if spot_price <= 0: return False
-
-        spread = swap_price - spot_price
-        spread_ratio = spread / spot_price
+        self.logger = logging.getLogger(__name__)
 
-        # 你的配置里 open_conditions 似乎混用了字段名，这里我们明确逻辑：
-        # 我们希望 Spread (价差) 足够大，且 Funding Rate (费率) 是正的
+        if not isinstance(params, StrategyParams):
+            params = StrategyParams.from_config(params)
+        self.params = params
 
-        # 假设 spread 阈值是 0.1% (0.001)
-        is_spread_ok = spread_ratio > 0.001
-        is_funding_ok = funding_rate > self.min_funding_rate
+        # 核心阈值
+        self.open_spread = params.open_spread
+        self.min_funding_rate = params.min_funding_rate
+        self.close_spread = params.close_spread
 
-        if is_spread_ok and is_funding_ok:
-            self.logger.info(f"✅ 开仓条件满足: 价差 {spread_ratio:.4%}, 费率 {funding_rate:.4%}")
+    def should_open(self, spot_price: float, swap_price: float, funding_rate: float) -> bool:
+        """
+        判断是否开仓
+        逻辑：(合约 - 现货) / 现货 > 阈值 且 费率 > 最低要求
+        """
+        # 价差阈值固定为 0.1%（spread_threshold 配置字段含义不一致，暂不使用），费率需为正
+        if _eval_open(spot_price, swap_price, funding_rate, OPEN_SPREAD_RATIO, self.min_funding_rate):
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(
+                    "✅ 开仓条件满足: 价差 %.4f%%, 费率 %.4f%%",
+                    (swap_price - spot_price) / spot_price * 100, funding_rate * 100,
+                )
             return True
 
         return False
@@ -46,14 +95,13 @@ class StrategyConditions:
         判断是否平仓
         逻辑：价差回归到 0 或 费率转负
         """
-        if spot_price <= 0: return False
-
-        spread = swap_price - spot_price
-        spread_ratio = spread / spot_price
-
         # 平仓：价差极小 或 费率变负
-        if spread_ratio <= 0.0005 or funding_rate <= 0:
-            self.logger.info(f"✅ 平仓条件满足: 价差 {spread_ratio:.4%}, 费率 {funding_rate:.4%}")
+        if _eval_close(spot_price, swap_price, funding_rate, CLOSE_SPREAD_RATIO, 0.0):
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(
+                    "✅ 平仓条件满足: 价差 %.4f%%, 费率 %.4f%%",
+                    (swap_price - spot_price) / spot_price * 100, funding_rate * 100,
+                )
             return True
 
-        return False
\ No newline at end of file
+        return False
@@ -5,6 +5,8 @@ import logging
 from typing import Dict, Optional, List
 import math
 
+import numpy as np
+
 from strategy.base_strategy import BaseStrategy
 
 class FuturesGridStrategy(BaseStrategy):
@@ -28,7 +30,7 @@ class FuturesGridStrategy(BaseStrategy):
         注意：具体的杠杆设置建议移交至 OrderManager 或 execution 层统一处理，
         此处策略只负责汇报它需要的杠杆倍数。
         """
-        self.logger.info(f"✅ 网格策略 ({self.symbol}) 已就绪，等待扫描信号...")
+        self.logger.info("✅ 网格策略 (%s) 已就绪，等待扫描信号...", self.symbol)
         self.is_initialized = True
 
     async def analyze_signal(self) -> Optional[Dict]:
@@ -60,41 +62,38 @@ class FuturesGridStrategy(BaseStrategy):
             # 计算每格价格间隔
             price_step = (upper_price - lower_price) / self.grid_count
 
-            # 4. 生成所有网格挂单明细 (Plan Orders)
-            pending_orders = []
-
             # 计算单格下单数量 (假设做多网格，资金均分)
             # 注意：实际需考虑合约面值(contract_val)和最小下单单位
             # 这里简化为按 USDT 价值估算张数，实际需调用 instrument info
             total_margin = self.investment * self.leverage
             amount_per_grid = total_margin / self.grid_count
             # 假设 1张 = 10 USDT (需根据币种调整，这里仅做演示)
-            size_per_grid = max(1, int(amount_per_grid / 10))
+            size = str(max(1, int(amount_per_grid / 10)))
 
-            self.logger.info(f"📊 [网格计算] 价格:{current_price} | 区间:[{lower_price:.2f}, {upper_price:.2f}] | 格数:{self.grid_count}")
+            self.logger.info(
+                "📊 [网格计算] 价格:%s | 区间:[%.2f, %.2f] | 格数:%d",
+                current_price, lower_price, upper_price, self.grid_count,
+            )
 
-            # 循环生成 Limit Orders
-            for i in range(self.grid_count):
-                grid_price = lower_price + (i * price_step)
-
-                # 简单逻辑：
-                # 低于当前价 -> 挂买单 (做多接货)
-                # 高于当前价 -> 挂卖单 (平仓获利)
-                if grid_price < current_price:
-                    side = "buy"
-                else:
-                    side = "sell"
-
-                # 构造标准订单结构
-                order_plan = {
+            # 4. 生成所有网格挂单明细 (Plan Orders)
+            # 简单逻辑：
+            # 低于当前价 -> 挂买单 (做多接货)
+            # 高于当前价 -> 挂卖单 (平仓获利)
+            grid_prices = lower_price + np.arange(self.grid_count) * price_step
+            sides = np.where(grid_prices < current_price, "buy", "sell")
+
+            # 构造标准订单结构
+            pending_orders = [
+                {
                     "symbol": self.symbol,
                     "price": f"{grid_price:.4f}", # 格式化价格
-                    "size": str(size_per_grid),
+                    "size": size,
                     "side": side,
                     "type": "limit",              # 限价单
                     "reduce_only": False          # 网格单通常非只减仓
                 }
-                pending_orders.append(order_plan)
+                for grid_price, side in zip(grid_prices.tolist(), sides.tolist())
+            ]
 
             # 5. 打包信号并返回给 Runtime/Audit
             if pending_orders:
@@ -106,13 +105,13 @@ class FuturesGridStrategy(BaseStrategy):
                     "orders": pending_orders,     # 🔥 核心：包含 20-30 个待执行订单的列表
                     "reason": f"Grid Init: {lower_price:.2f}-{upper_price:.2f}"
                 }
-                self.logger.info(f"🚀 [策略产出] 生成 {len(pending_orders)} 个网格挂单计划，发送至审计...")
+                self.logger.info("🚀 [策略产出] 生成 %d 个网格挂单计划，发送至审计...", len(pending_orders))
                 return signal
 
             return None
 
         except Exception as e:
-            self.logger.error(f"策略分析异常: {e}")
+            self.logger.error("策略分析异常: %s", e)
             return None
 
     async def shutdown(self):
@@ -5,6 +5,35 @@
 import numpy as np
 import pandas as pd
 
+from core.jit import njit
+from strategy.indicators import klines_to_ndarray
+
+
+@njit(cache=True)
+def _bbands(closes, period, k):
+    """
+    最新一个窗口的布林带（closes 为 OKX 顺序，最新在前）
+
+    Welford 单次遍历计算均值与样本标准差（ddof=1，与 pandas rolling.std 一致）
+
+    Returns:
+        (upper, lower, current)，数据不足一个窗口时上下轨为 NaN
+    """
+    current = closes[0] if closes.shape[0] > 0 else np.nan
+    if period < 2 or closes.shape[0] < period:
+        return np.nan, np.nan, current
+
+    mean = 0.0
+    m2 = 0.0
+    for i in range(period):
+        x = closes[i]
+        delta = x - mean
+        mean += delta / (i + 1)
+        m2 += delta * (x - mean)
+    std = np.sqrt(m2 / (period - 1))
+
+    return mean + k * std, mean - k * std, current
+
 
 class GridUtils:
 
@@ -12,28 +41,14 @@ class GridUtils:
     def calculate_bollinger_bands(klines: list, period: int = 20, std_dev: float = 2.0):
         """
         计算布林带 (用于确定网格上下限)
-        :param klines: OKX K线数据 [[ts, o, h, l, c, ...], ...]
+        :param klines: OKX K线数据 [[ts, o, h, l, c, ...], ...]（最新在前），或 klines_to_ndarray 数组
         :return: (upper_band, lower_band, current_price)
         """
-        # 1. 转换为 Pandas DataFrame
-        df = pd.DataFrame(klines, columns=["ts", "o", "h", "l", "c", "vol", "volCcy", "volCcyQuote", "confirm"])
-        df["c"] = df["c"].astype(float)
-
-        # 2. 按照时间正序排列 (OKX 返回是倒序的)
-        df = df.iloc[::-1].reset_index(drop=True)
-
-        # 3. 计算 SMA (中轨) 和 STD (标准差)
-        df["sma"] = df["c"].rolling(window=period).mean()
-        df["std"] = df["c"].rolling(window=period).std()
-
-        # 4. 计算上下轨
-        df["upper"] = df["sma"] + (df["std"] * std_dev)
-        df["lower"] = df["sma"] - (df["std"] * std_dev)
-
-        # 5. 获取最新值
-        latest = df.iloc[-1]
+        # 只需要最新一个窗口：取收盘价列，交给数值内核计算
+        closes = np.ascontiguousarray(klines_to_ndarray(klines)[:, 4])
+        upper, lower, current = _bbands(closes, int(period), float(std_dev))
 
-        return float(latest["upper"]), float(latest["lower"]), float(latest["c"])
+        return float(upper), float(lower), float(current)
 
     @staticmethod
     def calculate_atr(klines: list, period: int = 14):
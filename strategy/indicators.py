@@ -6,7 +6,85 @@
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
+
+from core.jit import njit, NUMBA_AVAILABLE
+
+# 数组格式 K 线的列顺序
+KLINE_COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
+
+
+# ============ 数值内核（仅在 numba 可用时使用，否则走 pandas 实现） ============
+# 语义与 pandas 实现一致：rolling 窗口内有 NaN 则结果为 NaN，分母为 0 记为 NaN
+# 不使用 fastmath：它假设输入无 NaN，会破坏上述语义
+
+
+@njit(cache=True)
+def _rolling_mean_kernel(x, period):
+    """简单移动平均（等价于 Series.rolling(period).mean()）"""
+    n = x.shape[0]
+    out = np.full(n, np.nan)
+    for i in range(period - 1, n):
+        total = 0.0
+        for j in range(i - period + 1, i + 1):
+            total += x[j]
+        out[i] = total / period
+    return out
+
+
+@njit(cache=True)
+def _atr_kernel(high, low, close, period):
+    """真实波幅的简单移动平均"""
+    n = high.shape[0]
+    tr = np.empty(n)
+    for i in range(n):
+        value = high[i] - low[i]
+        if i > 0:
+            # 与 DataFrame.max(axis=1) 一致：跳过 NaN
+            for candidate in (abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1])):
+                if np.isnan(value) or candidate > value:
+                    value = candidate
+        tr[i] = value
+    return _rolling_mean_kernel(tr, period)
+
+
+@njit(cache=True)
+def _adx_kernel(high, low, atr, period):
+    """平均趋向指数（+DM/-DM 与 DX 均取简单移动平均）"""
+    n = high.shape[0]
+    plus_dm = np.zeros(n)
+    minus_dm = np.zeros(n)
+    for i in range(1, n):
+        up = high[i] - high[i - 1]
+        down = low[i - 1] - low[i]
+        if up > down:
+            plus_dm[i] = max(up, 0.0)
+        if down > up:
+            minus_dm[i] = max(down, 0.0)
+
+    plus_dm_smooth = _rolling_mean_kernel(plus_dm, period)
+    minus_dm_smooth = _rolling_mean_kernel(minus_dm, period)
+
+    dx = np.empty(n)
+    for i in range(n):
+        tr = atr[i] if atr[i] != 0 else np.nan
+        plus_di = 100 * plus_dm_smooth[i] / tr
+        minus_di = 100 * minus_dm_smooth[i] / tr
+        di_sum = plus_di + minus_di
+        dx[i] = 100 * abs(plus_di - minus_di) / (di_sum if di_sum != 0 else np.nan)
+    return _rolling_mean_kernel(dx, period)
+
+
+@njit(cache=True)
+def _adx_atr_kernel(high, low, close, period):
+    """一次遍历同时得到 ADX 与 ATR"""
+    atr = _atr_kernel(high, low, close, period)
+    return _adx_kernel(high, low, atr, period), atr
+
+
+def _column_array(df: pd.DataFrame, col: str) -> np.ndarray:
+    """取出连续的 float64 列，供数值内核使用"""
+    return np.ascontiguousarray(df[col].to_numpy(dtype=np.float64))
 
 
 def calculate_ema(df: pd.DataFrame, period: int, price_col: str = "close") -> pd.Series:
@@ -35,6 +113,12 @@ def calculate_atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
     Returns:
         pd.Series: ATR 值
     """
+    if NUMBA_AVAILABLE:
+        atr = _atr_kernel(
+            _column_array(df, "high"), _column_array(df, "low"), _column_array(df, "close"), period
+        )
+        return pd.Series(atr, index=df.index)
+
     high_low = df["high"] - df["low"]
     high_close = np.abs(df["high"] - df["close"].shift())
     low_close = np.abs(df["low"] - df["close"].shift())
@@ -97,6 +181,16 @@ def calculate_adx(df: pd.DataFrame, period: int = 14) -> pd.Series:
     Returns:
         pd.Series: ADX 值
     """
+    if NUMBA_AVAILABLE:
+        high = _column_array(df, "high")
+        low = _column_array(df, "low")
+        if "atr" in df.columns:
+            # 沿用调用方已计算的 ATR
+            adx = _adx_kernel(high, low, _column_array(df, "atr"), period)
+        else:
+            adx, _ = _adx_atr_kernel(high, low, _column_array(df, "close"), period)
+        return pd.Series(adx, index=df.index)
+
     # 计算 +DM 和 -DM
     df["+dm"] = np.where(
         (df["high"] - df["high"].shift(1)) > (df["low"].shift(1) - df["low"]),
@@ -196,18 +290,52 @@ def calculate_volume_profile(df: pd.DataFrame, bins: int = 20) -> Dict:
     }
 
 
-def normalize_klines(klines: List[Dict]) -> pd.DataFrame:
+def klines_to_ndarray(klines: Union[List, np.ndarray]) -> np.ndarray:
+    """
+    K 线转换为 (N, 6) float64 数组，列为 [ts, open, high, low, close, volume]
+
+    拉取时转换一次，后续指标计算直接使用数组，不再逐行解析字符串
+
+    Args:
+        klines: OKX 列表格式 / 字典格式 K 线，或已转换的数组
+
+    Returns:
+        np.ndarray: 连续的 float64 数组
+    """
+    if isinstance(klines, np.ndarray):
+        return klines
+    if not klines:
+        return np.empty((0, len(KLINE_COLUMNS)), dtype=np.float64)
+
+    if isinstance(klines[0], (list, tuple)):
+        rows = [row[:6] for row in klines]
+    else:
+        rows = [
+            (k.get("t", 0), k.get("o", 0), k.get("h", 0), k.get("l", 0), k.get("c", 0), k.get("vol", k.get("vc", 0)))
+            for k in klines
+        ]
+    return np.asarray(rows, dtype=np.float64)
+
+
+def normalize_klines(klines: Union[List[Dict], np.ndarray, pd.DataFrame]) -> pd.DataFrame:
     """
     标准化 K 线数据为 DataFrame
 
     Args:
-        klines: K线数据列表，支持两种格式：
+        klines: K线数据，支持以下格式：
             1. 列表格式（OKX API 返回）：[[ts, o, h, l, c, vol, volCcy, volCcyQuote, confirm], ...]
             2. 字典格式：[{"t": ts, "o": open, "h": high, "l": low, "c": close, "vol": volume}, ...]
+            3. 数组格式：klines_to_ndarray 的结果，直接包装不再解析
+            4. 已标准化的 DataFrame，原样返回
 
     Returns:
         pd.DataFrame: 标准化的 DataFrame
     """
+    if isinstance(klines, pd.DataFrame):
+        return klines
+    if isinstance(klines, np.ndarray):
+        return pd.DataFrame(klines[:, :len(KLINE_COLUMNS)], columns=KLINE_COLUMNS, copy=False)
+
     if not klines:
         return pd.DataFrame()
 
@@ -239,7 +367,7 @@ def normalize_klines(klines: List[Dict]) -> pd.DataFrame:
 
 
 def calculate_all_indicators(
-    klines: List[Dict],
+    klines: Union[List[Dict], np.ndarray, pd.DataFrame],
     adx_period: int = 14,
     atr_period: int = 14,
     ema_period: int = 20,
@@ -270,11 +398,16 @@ def calculate_all_indicators(
     # 计算所有指标
     indicators = {}
 
-    # ATR
-    indicators["atr"] = calculate_atr(df, atr_period).iloc[-1]
-
-    # ADX
-    indicators["adx"] = calculate_adx(df, adx_period).iloc[-1]
+    # ATR / ADX（周期相同时一次内核调用同时得到）
+    if NUMBA_AVAILABLE and adx_period == atr_period and "atr" not in df.columns:
+        adx, atr = _adx_atr_kernel(
+            _column_array(df, "high"), _column_array(df, "low"), _column_array(df, "close"), atr_period
+        )
+        indicators["atr"] = atr[-1]
+        indicators["adx"] = adx[-1]
+    else:
+        indicators["atr"] = calculate_atr(df, atr_period).iloc[-1]
+        indicators["adx"] = calculate_adx(df, adx_period).iloc[-1]
 
     # EMA
     indicators[f"ema_{ema_period}"] = calculate_ema(df, ema_period).iloc[-1]
@@ -296,3 +429,10 @@ def calculate_all_indicators(
     indicators["price_change_pct"] = ((df["close"].iloc[-1] - df["close"].iloc[-2]) / df["close"].iloc[-2] * 100) if len(df) > 1 else 0
 
     return indicators
+
+
+if NUMBA_AVAILABLE:
+    # 导入时预热：从磁盘缓存加载（或首次编译）内核，避免首个品种分析承担编译延迟
+    _warmup = np.linspace(1.0, 2.0, 32)
+    _adx_atr_kernel(_warmup + 0.5, _warmup, _warmup + 0.25, 14)
+    del _warmup
@@ -8,9 +8,11 @@
 """
 
 import logging
-from typing import Dict, List, Optional, Literal
+from typing import Dict, List, Optional, Literal, Union
 from dataclasses import dataclass
 
+import numpy as np
+
 from .indicators import (
     calculate_all_indicators,
     normalize_klines,
@@ -28,7 +30,7 @@ logger = logging.getLogger(__name__)
 RegimeType = Literal["TREND", "RANGE", "CHAOS"]
 
 
-@dataclass
+@dataclass(slots=True)
 class RegimeAnalysis:
     """市场环境分析结果"""
 
@@ -107,7 +109,7 @@ class RegimeDetector:
 
         self.logger = logging.getLogger(__name__)
 
-    def analyze(self, symbol: str, klines: List[Dict]) -> Optional[RegimeAnalysis]:
+    def analyze(self, symbol: str, klines: Union[List[Dict], np.ndarray]) -> Optional[RegimeAnalysis]:
         """
         分析市场环境
 
@@ -120,6 +122,7 @@ class RegimeDetector:
                 - l: 最低价
                 - c: 收盘价
                 - vol: 成交量
+                也可以是 klines_to_ndarray 转换后的 (N, 6) 数组，此时跳过解析
 
         Returns:
             RegimeAnalysis: 市场环境分析结果
@@ -129,9 +132,12 @@ class RegimeDetector:
             return None
 
         try:
+            # 只标准化一次，指标计算与后续分析共用同一个 DataFrame
+            df = normalize_klines(klines)
+
             # 使用公共工具计算所有指标
             indicators = calculate_all_indicators(
-                klines,
+                df,
                 adx_period=self.atr_period,
                 atr_period=self.atr_period,
                 ema_period=self.ema_period,
@@ -145,7 +151,6 @@ class RegimeDetector:
                 return None
 
             # 获取 K 线数据用于进一步分析
-            df = normalize_klines(klines)
             latest = df.iloc[-1]
             recent = df.tail(20)  # 最近 20 根 K 线
 
@@ -1,6 +1,6 @@
 import logging
 import asyncio
-from typing import Dict, Optional, Any
+from typing import Dict, List, Optional, Any, Sequence, Tuple
 
 from core.context import Context
 from core.events import EventBus
@@ -48,7 +48,7 @@ class StrategyManager:
         strategy_type = self._map_regime_to_strategy_type(regime)
 
         if not strategy_type:
-            self.logger.debug(f"Markets ({regime}) 不适合交易，跳过 {symbol}")
+            self.logger.debug("Markets (%s) 不适合交易，跳过 %s", regime, symbol)
             return None
 
         # 2. 获取或创建策略实例
@@ -80,6 +80,15 @@ class StrategyManager:
 
         return None
 
+    async def generate_batch(self, candidates: Sequence[Tuple[str, str]]) -> List[Optional[Dict]]:
+        """
+        批量生成信号：各 (symbol, regime) 的分析并发执行（行情请求可重叠）
+
+        Returns:
+            与 candidates 顺序一致的信号列表，无信号的位置为 None
+        """
+        return await asyncio.gather(*(self.generate(symbol, regime) for symbol, regime in candidates))
+
     def _map_regime_to_strategy_type(self, regime: str) -> Optional[str]:
         """
         根据市场环境映射策略类型
@@ -5,15 +5,21 @@
 
 import sys
 import asyncio
+import math
+import statistics
 from pathlib import Path
 from datetime import datetime
 
 # 添加项目根目录到路径
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from core.context import Context, Balance, Position
+from core.context import Context, Balance, Position, MarketData
 from risk.margin_guard import MarginGuard
 from risk.circuit_breaker import CircuitBreaker
+from risk.fund_guard import FundGuard
+from risk.liquidity_guard import LiquidityGuard
+from risk.exchange_guard import ExchangeGuard
+from risk.risk_manager import RiskManager
 import yaml
 
 
@@ -137,6 +143,135 @@ async def test_circuit_breaker():
     return True
 
 
+async def test_liquidity_guard():
+    """测试流动性防护"""
+    print("\n" + "=" * 60)
+    print("🧪 流动性防护测试")
+    print("=" * 60)
+
+    liquidity_guard = LiquidityGuard({"min_depth_threshold": 10000})
+    context = Context(config_dir="config", data_dir="data")
+    for symbol, amount in (("BTC-USDT", 10), ("ETH-USDT", 0.01)):
+        context.update_market_data(
+            MarketData(
+                symbol=symbol,
+                spot_price=50000,
+                futures_price=50010,
+                funding_rate=0.0001,
+                next_funding_time=None,
+                volume_24h=1_000_000,
+                depth={
+                    "bid_1_price": 49999,
+                    "bid_1_amount": amount,
+                    "ask_1_price": 50001,
+                    "ask_1_amount": amount,
+                },
+            )
+        )
+
+    print("\n1️⃣  测试单品种检查")
+    result = await liquidity_guard.check("BTC-USDT", 0.001, context)
+    assert result.is_adequate
+    result = await liquidity_guard.check("ETH-USDT", 0.001, context)
+    assert not result.is_adequate
+    assert result.estimated_slippage == 0.0  # 深度不足时短路，不再估算滑点
+    strict_result = await liquidity_guard.check("ETH-USDT", 0.001, context, strict=True)
+    assert not strict_result.is_adequate
+    assert strict_result.estimated_slippage > 0
+    print(f"  ✅ {result.message}")
+
+    stats = liquidity_guard.get_depth_stats("BTC-USDT")
+    assert stats["count"] == 1
+    assert stats["mean"] == liquidity_guard.get_depth_history("BTC-USDT")[-1]
+
+    # 统计只覆盖最近 100 个深度值：前 50 个样本被挤出后不再影响均值 / 标准差
+    for i in range(150):
+        liquidity_guard._record_depth("WINDOW-USDT", 1_000_000.0 if i < 50 else 10_000.0 + i)
+    window = liquidity_guard.get_depth_history("WINDOW-USDT", limit=100)
+    stats = liquidity_guard.get_depth_stats("WINDOW-USDT")
+    assert stats["count"] == len(window) == 100
+    assert math.isclose(stats["mean"], statistics.fmean(window), rel_tol=1e-6)
+    assert math.isclose(stats["std"], statistics.stdev(window), rel_tol=1e-6)
+    print(f"  ✅ 窗口统计: mean={stats['mean']:.2f}, std={stats['std']:.2f}")
+
+    print("\n✅ 流动性防护测试通过")
+
+    return True
+
+
+async def test_risk_manager():
+    """测试风控审批"""
+    print("\n" + "=" * 60)
+    print("🧪 风控审批测试")
+    print("=" * 60)
+
+    risk_manager = RiskManager(
+        config={},
+        margin_guard=MarginGuard({}),
+        fund_guard=FundGuard({}),
+        liquidity_guard=LiquidityGuard({"min_depth_threshold": 10000}),
+        circuit_breaker=CircuitBreaker({}),
+        exchange_guard=ExchangeGuard({}),
+    )
+    context = Context(config_dir="config", data_dir="data")
+    context.update_balance("USDT", 50000, 0)
+    context.update_market_data(
+        MarketData(
+            symbol="BTC-USDT",
+            spot_price=50000,
+            futures_price=50010,
+            funding_rate=0.0001,
+            next_funding_time=None,
+            volume_24h=1_000_000,
+            depth={
+                "bid_1_price": 49999,
+                "bid_1_amount": 10,
+                "ask_1_price": 50001,
+                "ask_1_amount": 10,
+            },
+        )
+    )
+    # ETH 盘口过薄：买一 / 卖一深度仅 ~$300，低于 $10000 阈值
+    context.update_market_data(
+        MarketData(
+            symbol="ETH-USDT",
+            spot_price=3000,
+            futures_price=3001,
+            funding_rate=0.0001,
+            next_funding_time=None,
+            volume_24h=1_000_000,
+            depth={
+                "bid_1_price": 2999,
+                "bid_1_amount": 0.1,
+                "ask_1_price": 3001,
+                "ask_1_amount": 0.1,
+            },
+        )
+    )
+    signal = {"symbol": "BTC-USDT", "side": "buy", "size": 0.001}
+
+    print("\n1️⃣  测试无上下文审批")
+    result = await risk_manager.check_order(signal)
+    assert result["approved"]
+    print(f"  ✅ {result['reason']}")
+
+    print("\n2️⃣  测试带上下文审批 (流动性 + 保证金)")
+    result = await risk_manager.check_order(signal, context)
+    assert result["approved"]
+    assert result["modified_size"] == 0.001
+    print(f"  ✅ {result['reason']}")
+
+    print("\n3️⃣  测试流动性不足被拒绝")
+    result = await risk_manager.check_order({**signal, "symbol": "ETH-USDT"}, context)
+    assert not result["approved"]
+    assert result["reason"].startswith("Insufficient liquidity: Low liquidity")
+    print(f"  ✅ {result['reason']}")
+
+    print("\n✅ 风控审批测试通过")
+
+    return True
+
+
 async def main():
     """主函数"""
     print("=" * 60)
@@ -145,9 +280,13 @@ async def main():
 
     results = []
 
-    # 运行测试
-    results.append(await test_margin_guard())
-    results.append(await test_circuit_breaker())
+    # 运行测试（逐项捕获异常，单项失败不影响后续测试）
+    for test in (test_liquidity_guard, test_risk_manager, test_circuit_breaker, test_margin_guard):
+        try:
+            results.append(await test())
+        except Exception as e:
+            print(f"\n❌ {test.__name__} 失败: {e!r}")
+            results.append(False)
 
     # 汇总结果
     print("\n" + "=" * 60)
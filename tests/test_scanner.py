@@ -0,0 +1,265 @@
+"""
+✅ 市场扫描测试
+使用模拟客户端测试市场扫描器的筛选与评分流程
+"""
+
+import sys
+import asyncio
+import random
+from pathlib import Path
+
+import numpy as np
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scanner.kline_cache import KlineCache
+from scanner.market_scanner import MarketScanner, ScanResult
+from strategy.regime_detector import RegimeDetector
+
+
+def create_mock_klines(num_klines=100, base_price=2500.0, seed=0):
+    """创建模拟 K 线数据（OKX 格式，9 列）"""
+    rng = random.Random(seed)
+    klines = []
+    for i in range(num_klines):
+        open_price = base_price + rng.uniform(-50, 50)
+        close_price = open_price + rng.uniform(-20, 20)
+        high_price = max(open_price, close_price) + rng.uniform(0, 10)
+        low_price = min(open_price, close_price) - rng.uniform(0, 10)
+        volume = rng.uniform(1000, 10000)
+        klines.append([
+            str(1_700_000_000_000 + i * 4 * 3600 * 1000),
+            str(open_price),
+            str(high_price),
+            str(low_price),
+            str(close_price),
+            str(volume),
+            str(volume * close_price),
+            str(volume * close_price),
+            "1",
+        ])
+        base_price = close_price
+    return klines
+
+
+class MockClient:
+    """模拟 OKX 客户端"""
+
+    def __init__(self, instruments):
+        self.instruments = instruments
+        self.kline_calls = 0
+
+    async def _request(self, method, endpoint, params=None, data=None):
+        if endpoint == "/api/v5/public/instruments":
+            return [{"instId": inst, "state": "live"} for inst in self.instruments]
+        return None
+
+    async def get_candlesticks(self, instId, bar="4H", limit=100, as_array=False):
+        self.kline_calls += 1
+        await asyncio.sleep(0)
+        klines = create_mock_klines(limit, seed=sum(map(ord, instId)))
+        if as_array:
+            return np.asarray([row[:6] for row in klines], dtype=np.float64)
+        return klines
+
+
+class MockMarketDataFetcher:
+    """模拟行情获取器"""
+
+    def __init__(self, tickers):
+        self.tickers = tickers
+
+    async def get_tickers_by_symbols(self, symbols):
+        return [dict(t) for t in self.tickers if t["instId"] in symbols]
+
+
+def create_mock_tickers():
+    """创建模拟 Ticker：成交额 / 涨跌幅各不相同"""
+    return [
+        # 通过初筛
+        {"instId": "BTC-USDT-SWAP", "last": "105", "open24h": "100", "high24h": "106", "low24h": "99", "volCcy24h": "2000000"},
+        {"instId": "ETH-USDT-SWAP", "last": "97", "open24h": "100", "high24h": "101", "low24h": "95", "volCcy24h": "1500000"},
+        {"instId": "SOL-USDT-SWAP", "last": "110", "open24h": "100", "high24h": "112", "low24h": "99", "volCcy24h": "800000"},
+        # 成交额过低
+        {"instId": "DOGE-USDT-SWAP", "last": "105", "open24h": "100", "high24h": "106", "low24h": "99", "volCcy24h": "10"},
+        # 涨跌幅过低
+        {"instId": "XRP-USDT-SWAP", "last": "100.1", "open24h": "100", "high24h": "101", "low24h": "99", "volCcy24h": "2000000"},
+        # 涨跌幅过高
+        {"instId": "PEPE-USDT-SWAP", "last": "150", "open24h": "100", "high24h": "150", "low24h": "99", "volCcy24h": "2000000"},
+        # 开盘价为 0
+        {"instId": "NEW-USDT-SWAP", "last": "1", "open24h": "0", "high24h": "1", "low24h": "1", "volCcy24h": "2000000"},
+    ]
+
+
+def create_scanner(top_n=2):
+    tickers = create_mock_tickers()
+    client = MockClient([t["instId"] for t in tickers])
+    config = {
+        "top_n": top_n,
+        "min_volume_24h": 10_000_000,
+        "min_price_change": 1.0,
+        "max_price_change": 20.0,
+        "trend_only": False,
+    }
+    scanner = MarketScanner(client, MockMarketDataFetcher(tickers), config, RegimeDetector({}))
+    return scanner, client
+
+
+async def test_filter_tickers():
+    """测试初筛"""
+    print("\n" + "=" * 60)
+    print("🧪 初筛测试")
+    print("=" * 60)
+
+    scanner, _ = create_scanner()
+    filtered = scanner._filter_tickers(create_mock_tickers())
+    symbols = [t["instId"] for t in filtered]
+
+    # 按成交额降序
+    assert symbols == ["BTC-USDT-SWAP", "ETH-USDT-SWAP", "SOL-USDT-SWAP"]
+    btc = filtered[0]
+    assert abs(btc["_volume_24h"] - 2_000_000 * 105) < 1e-6
+    assert abs(btc["_price_change_24h"] - 5.0) < 1e-9
+    assert btc["_current_price"] == 105.0
+    assert btc["_high_24h"] == 106.0
+    assert btc["_low_24h"] == 99.0
+    print(f"  ✅ 通过: {symbols}")
+
+    print("\n✅ 初筛测试通过")
+
+    return True
+
+
+async def test_scan():
+    """测试完整扫描流程"""
+    print("\n" + "=" * 60)
+    print("🧪 完整扫描测试")
+    print("=" * 60)
+
+    scanner, client = create_scanner(top_n=2)
+    results = await scanner.scan()
+
+    assert 0 < len(results) <= 2
+    assert all(isinstance(r, ScanResult) for r in results)
+    scores = [r.score for r in results]
+    assert scores == sorted(scores, reverse=True)
+    for r in results:
+        assert 0 <= r.score <= 100
+        print(f"  ✅ {r.symbol}: {r.score:.2f} ({r.regime})")
+
+    print("\n2️⃣  测试缓存：连续扫描不重复拉取品种列表")
+    instrument_calls = []
+    original_request = client._request
+
+    async def counting_request(method, endpoint, params=None, data=None):
+        instrument_calls.append(endpoint)
+        return await original_request(method, endpoint, params, data)
+
+    client._request = counting_request
+    await scanner.scan()
+    assert instrument_calls == []
+    print("  ✅ 品种列表命中缓存")
+
+    print("\n3️⃣  测试流水线：进程池（显式开启）与事件循环内分析结果一致")
+    pooled, _ = create_scanner(top_n=2)
+    pooled.analysis_workers = 2
+    pooled_results = await pooled.scan()
+    assert [(r.symbol, r.score) for r in pooled_results] == [(r.symbol, r.score) for r in results]
+    pooled.close()
+    print("  ✅ 结果一致")
+
+    print("\n4️⃣  测试环境分析缓存：K 线未更新时不重复计算")
+    analyze_calls = []
+    original_analyze = scanner.regime_detector.analyze
+
+    def counting_analyze(symbol, klines):
+        analyze_calls.append(symbol)
+        return original_analyze(symbol, klines)
+
+    scanner.regime_detector.analyze = counting_analyze
+    cached_results = await scanner.scan()
+    assert analyze_calls == []
+    assert [r.score for r in cached_results] == [r.score for r in results]
+    print("  ✅ 命中环境分析缓存")
+
+    print("\n✅ 完整扫描测试通过")
+
+    return True
+
+
+async def test_kline_cache():
+    """测试 K 线缓存"""
+    print("\n" + "=" * 60)
+    print("🧪 K 线缓存测试")
+    print("=" * 60)
+
+    klines = create_mock_klines(100, seed=5)[::-1]  # OKX 顺序：最新在前
+    cache = KlineCache(limit=100)
+    assert cache.get("BTC-USDT-SWAP", "4H", 100) is None
+
+    cache.seed("BTC-USDT-SWAP", "4H", klines)
+    cached = cache.get("BTC-USDT-SWAP", "4H", 100)
+    assert cached.shape == (100, 6)
+    assert cached[0, 0] == int(klines[0][0])
+    assert cached[-1, 4] == float(klines[-1][4])
+
+    detector = RegimeDetector({})
+    expected = detector.analyze("BTC-USDT-SWAP", klines)
+    actual = detector.analyze("BTC-USDT-SWAP", cached)
+    assert actual.regime == expected.regime
+    assert abs(actual.adx - expected.adx) < 1e-9
+    print("  ✅ 缓存结果与 REST 一致")
+
+    print("\n2️⃣  测试推送：同一时间戳覆盖，新时间戳追加")
+    last_ts = int(klines[0][0])
+    cache.update("BTC-USDT-SWAP", "4H", [str(last_ts), "1", "2", "0.5", "1.5", "10"])
+    cached = cache.get("BTC-USDT-SWAP", "4H", 100)
+    assert cached[0, 4] == 1.5 and cached[1, 0] == int(klines[1][0])
+
+    next_ts = last_ts + 4 * 3600 * 1000
+    cache.update("BTC-USDT-SWAP", "4H", [str(next_ts), "1.5", "2", "1", "1.8", "10"])
+    cached = cache.get("BTC-USDT-SWAP", "4H", 100)
+    assert cached[0, 0] == next_ts and cached[1, 0] == last_ts
+    assert cached[-1, 0] == int(klines[-2][0])
+    print("  ✅ 环形缓冲更新正确")
+
+    print("\n✅ K 线缓存测试通过")
+
+    return True
+
+
+async def main():
+    """主函数"""
+    print("=" * 60)
+    print("🧪 市场扫描测试套件")
+    print("=" * 60)
+
+    results = []
+
+    # 运行测试
+    results.append(await test_filter_tickers())
+    results.append(await test_scan())
+    results.append(await test_kline_cache())
+
+    # 汇总结果
+    print("\n" + "=" * 60)
+    print("📋 测试结果汇总")
+    print("=" * 60)
+
+    total = len(results)
+    passed = sum(results)
+
+    print(f"\n总计: {passed}/{total} 项通过")
+
+    if all(results):
+        print("\n✅ 所有测试通过")
+        return 0
+    else:
+        print("\n❌ 部分测试失败")
+        return 1
+
+
+if __name__ == "__main__":
+    exit_code = asyncio.run(main())
+    sys.exit(exit_code)
@@ -0,0 +1,36 @@
+"""
+测试资金费率套利开平仓条件
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from strategy.conditions import StrategyConditions
+
+NAN = float("nan")
+
+
+def test_conditions_nan_funding_rate():
+    print("=" * 60)
+    print("测试费率缺失 (NaN) 时的开平仓判断")
+    print("=" * 60)
+
+    conditions = StrategyConditions({})
+
+    # 正常行情：价差 1%、费率 0.1% → 开仓，不平仓
+    assert conditions.should_open(100.0, 101.0, 0.001)
+    assert not conditions.should_close(100.0, 101.0, 0.001)
+
+    # 费率 NaN：不得开仓，已有持仓应平仓
+    assert not conditions.should_open(100.0, 101.0, NAN)
+    assert conditions.should_close(100.0, 101.0, NAN)
+    print("✅ 单品种: NaN 费率拒绝开仓并触发平仓")
+
+    # 现货价 NaN：不得开仓
+    assert not conditions.should_open(NAN, 101.0, 0.001)
+    print("✅ 单品种: NaN 现货价拒绝开仓")
+
+
+if __name__ == "__main__":
+    test_conditions_nan_funding_rate()